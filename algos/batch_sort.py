@@ -0,0 +1,145 @@
+"""
+Written by Nat Getahun
+
+Batch Sort
+----------
+Sorts lots of small lists in one call. Sorting a million 8-64 element lists one
+call at a time spends most of its time on call overhead rather than sorting, so
+this takes the whole batch at once and sorts every row in place.
+
+2-D NumPy arrays (every row the same width) are sorted all at once. Narrow ones
+go through a sorting network: a fixed sequence of compare-exchange steps on
+pairs of positions (Batcher's odd-even merge sort) that sorts any input of that
+width. Since the steps don't depend on the data, each one can be done for every
+row at once as a vectorized min/max over two columns (transposed first so each
+column is contiguous). The # of steps grows faster than the width though, and
+past NETWORK_MAX_WIDTH NumPy's own row-wise sort measures faster, so wider
+arrays use that instead.
+
+Lists of lists (possibly ragged) get insertion sort, which is what wins on tiny
+lists anyway, with the loop over rows kept inside one call. Big batches can be
+split across a process pool with workers > 1.
+
+Complexity (r rows of width w):
+    Network: Time O(r * wlog^2(w)), Space O(rw)
+    Insertion: Time O(r * w^2), Space O(1)
+"""
+from __future__ import annotations
+from typing import Any, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from sort_analytics import time_batch_versions
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only needed for 2-D arrays
+    np = None
+
+NETWORK_MAX_WIDTH = 4 # measured: from ~6 columns on, arr.sort(axis=1) wins
+DEFAULT_POOL_CUTOFF = 1 << 16 # rows, below this a pool costs more than it saves
+
+
+def batch_sort(rows: Any, prnt: bool=True, workers: int=1,
+               cutoff: int=DEFAULT_POOL_CUTOFF) -> None:
+    """Sort every row of a 2-D array or list of lists in place"""
+    if prnt:
+        print(f"Batch Sort\n\tUnsorted: {rows}")
+
+    if np is not None and isinstance(rows, np.ndarray):
+        if rows.ndim != 2:
+            raise ValueError("can only batch sort 2-D arrays")
+        _network_sort(rows)
+    elif workers > 1 and len(rows) >= cutoff:
+        _pool_sort(rows, workers)
+    else:
+        _insertion_sort_rows(rows)
+
+    if prnt:
+        print(f"\tSorted: {rows}")
+
+
+@lru_cache(maxsize=None)
+def network(n: int) -> Tuple[Tuple[int, int], ...]:
+    """Get Batcher's odd-even merge sort comparators (i, j) for width n"""
+    pairs = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+
+    return tuple(pairs)
+
+
+def _network_sort(arr: Any) -> None:
+    """Sort rows of a 2-D array with one vectorized min/max per comparator"""
+    width = arr.shape[1]
+    if width < 2 or not arr.shape[0]: # no rows, or rows already sorted
+        return
+    if width > NETWORK_MAX_WIDTH:
+        arr.sort(axis=1)
+        return
+
+    cols = np.ascontiguousarray(arr.T) # cols[i] is column i, contiguous
+    lo = np.empty_like(cols[0])
+    for i, j in network(width):
+        np.minimum(cols[i], cols[j], out=lo)
+        np.maximum(cols[i], cols[j], out=cols[j])
+        cols[i] = lo
+
+    arr[:] = cols.T
+
+
+def _insertion_sort_rows(rows: List[List[int]]) -> List[List[int]]:
+    """Insertion sort every row in place, all in one call"""
+    for lst in rows:
+        for i in range(1, len(lst)):
+            curr = lst[i]
+            j = i
+            while j >= 1 and lst[j - 1] > curr:
+                lst[j] = lst[j - 1]
+                j -= 1
+
+            lst[j] = curr
+
+    return rows
+
+
+def _pool_sort(rows: List[List[int]], workers: int) -> None:
+    """Split rows into 1 chunk per worker and sort the chunks in a pool"""
+    size = -(-len(rows) // workers)
+    chunks = [rows[lo:lo + size] for lo in range(0, len(rows), size)]
+    with ProcessPoolExecutor(workers) as pool:
+        idx = 0
+        for chunk in pool.map(_insertion_sort_rows, chunks):
+            for lst in chunk:
+                rows[idx][:] = lst
+                idx += 1
+
+
+# main
+if __name__ == "__main__":
+    from random import Random
+    from insertion_sort import insertion_sort_itr1
+
+    def one_at_a_time(rows: List[List[int]], prnt: bool=True) -> None:
+        """Baseline: one insertion_sort_itr1 call per row"""
+        for lst in rows:
+            insertion_sort_itr1(lst, False)
+
+    def numpy_sort(rows: Any, prnt: bool=True) -> None:
+        """Baseline: numpy's own row-wise sort"""
+        rows.sort(axis=1)
+
+    rng = Random(0)
+    for width in (4, 8, 16, 32, 64):
+        rows = [[rng.randrange(1000) for _ in range(width)] for _ in range(10**4)]
+        print(f"width {width}")
+        time_batch_versions([one_at_a_time, batch_sort], rows)
+        if np is not None:
+            time_batch_versions([batch_sort, numpy_sort], np.array(rows))
@@ -0,0 +1,275 @@
+"""
+Written by Nat Getahun
+
+Benchmark
+---------
+Timing harness behind sort_analytics.time_versions, plus a command line for
+sweeping sizes and input shapes and catching regressions in CI.
+
+Timing a single version on a single list goes:
+    - warm up: a few untimed calls so caches and the allocator settle
+    - calibrate: double the # of calls per run until a run takes >= RUN_TIME,
+    so timer resolution doesn't matter even for tiny lists
+    - measure: keep doing runs until MIN_RUNS are done and min_time has passed
+    (or max_runs is hit), reporting per-call min/median/p95/stddev
+
+Copies of the input are made before the clock starts, so copying isn't timed,
+and the garbage collector is off while the clock runs. Inputs can be lists or
+memory-mapped datasets from corpus.
+
+Results can be saved as JSON and compared against a saved baseline: anything
+whose median got slower by more than the threshold counts as a regression, and
+the command line exits with status 1 so a CI job fails.
+
+Usage:
+    python benchmark.py merge_sort:merge_sort_itr counting_sort:counting_sort \\
+        --sizes 1000 10000 --dists random sorted --out results.json \\
+        --baseline baseline.json --threshold 0.1
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from math import ceil
+from time import perf_counter
+import gc
+import json
+import platform
+import statistics
+import sys
+import corpus
+
+RUN_TIME = 0.005 # seconds per timed run, at minimum
+MIN_RUNS = 5
+DEFAULT_WARMUP = 2
+DEFAULT_MIN_TIME = 0.2 # seconds of runs per measurement, at minimum
+DEFAULT_MAX_RUNS = 1000
+DEFAULT_THRESHOLD = 0.1 # 10% slower median counts as a regression
+DEFAULT_SEED = 0
+
+DEFAULT_SUITE = [
+    'merge_sort:merge_sort_itr',
+    'counting_sort:counting_sort',
+    'counting_sort:counting_sort_in_place',
+    'radix_sort:radix_sort',
+    'hybrid_sort:hybrid_sort',
+]
+# every registered version, for tools that check all of them
+ALL_VERSIONS = [
+    'bubble_sort:bubble_sort',
+    'selection_sort:selection_sort',
+    'selection_sort:heap_sort',
+    'selection_sort:tournament_sort',
+    'insertion_sort:insertion_sort_rcr',
+    'insertion_sort:insertion_sort_itr1',
+    'insertion_sort:insertion_sort_itr2',
+    'insertion_sort:binary_insertion_sort',
+    'insertion_sort:shell_sort',
+    'insertion_sort:shell_sort_sedgewick',
+    'merge_sort:merge_sort',
+    'merge_sort:merge_sort_itr',
+    'parallel_merge_sort:parallel_merge_sort',
+    'counting_sort:counting_sort',
+    'counting_sort:counting_sort_in_place',
+    'counting_sort:counting_sort_np',
+    'counting_sort:counting_sort_in_place_np',
+    'parallel_counting_sort:parallel_counting_sort',
+    'radix_sort:radix_sort',
+    'radix_sort:radix_sort_16',
+    'external_sort:external_sort_lst',
+    'hybrid_sort:hybrid_sort',
+    'buffer_sort:insertion_sort_buf',
+    'buffer_sort:counting_sort_buf',
+    'buffer_sort:merge_sort_buf',
+]
+DEFAULT_SIZES = [100, 1000, 10000]
+# wide_outliers is opt-in, it'd have counting sort allocate ~2**63 counters
+DEFAULT_DISTS = [d for d in corpus.DISTS if d != 'wide_outliers']
+
+
+class Stats(NamedTuple):
+    min: float # all times are seconds per call
+    median: float
+    p95: float
+    stddev: float
+    runs: int
+    number: int # calls per run
+
+
+def version_name(version: Callable) -> str:
+    """Get the name a version is reported under"""
+    return getattr(version, '__name__', str(version))
+
+
+def as_list(lst: Sequence[int]) -> List[int]:
+    """Get a fresh copy of lst (memory-mapped datasets come back as lists)"""
+    if isinstance(lst, memoryview):
+        return lst.tolist()
+    if hasattr(lst, 'copy'): # ndarray slices are views, so copy for real
+        return lst.copy()
+    return lst[:]
+
+
+def fmt_time(seconds: float) -> str:
+    """Format a duration with whichever unit keeps it readable"""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.3f} ns"
+
+
+# measuring
+def measure(version: Callable, lst: List[int], warmup: int=DEFAULT_WARMUP,
+            min_time: float=DEFAULT_MIN_TIME, max_runs: int=DEFAULT_MAX_RUNS,
+            copy: Callable=as_list) -> Stats:
+    """Time version on copies of lst and summarize the per-call times"""
+    for _ in range(warmup):
+        version(copy(lst), False)
+
+    number = 1
+    while True:
+        elapsed = _run(version, lst, number, copy)
+        if elapsed >= RUN_TIME:
+            break
+        number *= 2
+
+    times = [elapsed / number]
+    start = perf_counter()
+    while len(times) < MIN_RUNS or (len(times) < max_runs
+                                    and perf_counter() - start < min_time):
+        times.append(_run(version, lst, number, copy) / number)
+
+    return _summarize(times, number)
+
+
+def _run(version: Callable, lst: List[int], number: int,
+         copy: Callable=as_list) -> float:
+    """Time number calls of version (on fresh copies) with the GC off"""
+    copies = [copy(lst) for _ in range(number)]
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter()
+        for fresh in copies:
+            version(fresh, False)
+        return perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _summarize(times: List[float], number: int) -> Stats:
+    """Reduce a list of per-call times to summary stats"""
+    times = sorted(times)
+    p95 = times[max(0, ceil(0.95 * len(times)) - 1)]
+    stddev = statistics.stdev(times) if len(times) > 1 else 0.0
+    return Stats(times[0], statistics.median(times), p95, stddev, len(times), number)
+
+
+# sweeping
+def make_input(dist: str, n: int, seed: int=DEFAULT_SEED) -> memoryview:
+    """Get a reproducible, memory-mapped dataset of n ints (see corpus)"""
+    return corpus.load(dist, n, seed)
+
+
+def sweep(versions: List[Callable], sizes: Sequence[int]=DEFAULT_SIZES,
+          dists: Sequence[str]=DEFAULT_DISTS, seed: int=DEFAULT_SEED,
+          **kwargs) -> List[Dict]:
+    """Measure every version on every (distribution, size) pair"""
+    results = []
+    for dist in dists:
+        for n in sizes:
+            lst = make_input(dist, n, seed)
+            for version in versions:
+                stats = measure(version, lst, **kwargs)
+                results.append({'version': version_name(version), 'dist': dist,
+                                'size': n, **stats._asdict()})
+
+    return results
+
+
+# saving and comparing
+def save_results(results: List[Dict], path: str) -> None:
+    """Write results, along with where they came from, to a JSON file"""
+    meta = {'python': platform.python_version(), 'machine': platform.machine(),
+            'platform': platform.platform()}
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+
+def load_results(path: str) -> List[Dict]:
+    """Read results from a JSON file written by save_results"""
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results: List[Dict], baseline: List[Dict],
+            threshold: float=DEFAULT_THRESHOLD) -> List[Dict]:
+    """Get every result whose median is > threshold slower than the baseline"""
+    base = {(r['version'], r['dist'], r['size']): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = base.get((r['version'], r['dist'], r['size']))
+        if old and r['median'] > old['median'] * (1 + threshold):
+            regressions.append({**r, 'baseline': old['median'],
+                                'ratio': r['median'] / old['median']})
+
+    return regressions
+
+
+def load_versions(specs: List[str]) -> List[Callable]:
+    """Import 'module:function' specs"""
+    versions = []
+    for spec in specs:
+        module, _, name = spec.partition(':')
+        versions.append(getattr(__import__(module), name))
+
+    return versions
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print results as a table"""
+    print(f"{'version':<28}{'dist':<15}{'size':>9}{'median':>14}"
+          f"{'min':>14}{'p95':>14}{'stddev':>14}")
+    for r in results:
+        print(f"{r['version']:<28}{r['dist']:<15}{r['size']:>9}"
+              f"{fmt_time(r['median']):>14}{fmt_time(r['min']):>14}"
+              f"{fmt_time(r['p95']):>14}{fmt_time(r['stddev']):>14}")
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    """Command line entry point, returns the exit status"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark sorting versions")
+    parser.add_argument('specs', nargs='*', default=DEFAULT_SUITE,
+                        help="versions as module:function")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--dists', nargs='+', default=DEFAULT_DISTS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--out', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against this JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = sweep(load_versions(args.specs), args.sizes, args.dists,
+                    args.seed, min_time=args.min_time)
+    print_results(results)
+    if args.out:
+        save_results(results, args.out)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['version']} {r['dist']} n={r['size']}: "
+                  f"{fmt_time(r['baseline'])} -> {fmt_time(r['median'])} "
+                  f"({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+
+    return 0
+
+
+# main
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ Complexity:
 from __future__ import annotations
 from typing import List
 from sort_analytics import test_versions, time_versions, DEFAULT_UNSORTED_LIST
+from sort_trace import SortTrace, PASS, SWAP, render
 
 
 def bubble_sort(lst: List[int], prnt: bool=True) -> None:
@@ -38,32 +39,35 @@ def bubble_sort(lst: List[int], prnt: bool=True) -> None:
         print(f"\tSorted: {lst}")
 
 
-def bubble_sort_visualizer(lst: List[int]) -> None:
-    print(f"Visualizer\n\tUnsorted: {lst}\n")
+def bubble_sort_traced(lst: List[int]) -> SortTrace:
+    """Sort like bubble_sort, recording every pass and swap into a trace"""
+    trace = SortTrace(lst)
+    record = trace.record
 
     for i in range(len(lst))[::-1]:
         swapped = False
-        print(f"\tIteration {len(lst) - i}")
+        record(PASS, len(lst) - i)
         for j in range(i):
             if lst[j] > lst[j + 1]:
-                # pretty printing
-                print(f"\t\tPre:  {lst}")
-                lst_split = str(lst).split()
-                gap1 = len(' '.join(lst_split[:j]))
-                gap2 = len(lst_split[j]) - 1 * (lst_split[j][0] == '[')
-                print(f"\t\t      {gap1 * ' '} ^{gap2 * ' '}^")
-
-                # actual work
                 tmp = lst[j]
                 lst[j] = lst[j + 1]
                 lst[j + 1] = tmp
+                record(SWAP, j, j + 1)
                 swapped = True
 
-                print(f"\t\tPost: {lst}\n\n")
-
         if not swapped:
             break
 
+    return trace
+
+
+def bubble_sort_visualizer(lst: List[int]) -> None:
+    print(f"Visualizer\n\tUnsorted: {lst}\n")
+
+    # sort first, then render the recorded trace
+    for line in render(bubble_sort_traced(lst)):
+        print(line)
+
     print(f"\tSorted: {lst}\nVisualizer Done\n\n")
 
 
@@ -77,5 +81,5 @@ if __name__ == "__main__":
 
     test_versions(versions) # valid
     time_versions(versions)
-    # short: 8.443 µs
-    # long: 33.583 s
\ No newline at end of file
+    # short: 9.640 µs
+    # long: 34.384 ms
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Written by Nat Getahun
+
+Buffer Sort
+-----------
+In-place versions of insertion sort, counting sort, and the iterative merge sort
+that work directly on anything exposing a writable buffer (array.array,
+bytearray, mmap, numpy arrays, ...) through a typed memoryview, so the data
+never gets boxed into a python list. Raw byte buffers (bytearray and mmap) are
+read as native int64s; typed ones (array.array, numpy arrays, memoryviews) keep
+their own format, even when that's bytes ('B').
+
+The sorting loops are the same ones the list versions use - memoryviews index
+and slice-assign just like lists do - and plain lists are still accepted as is.
+The only real differences are:
+    - merge sort's one auxiliary buffer is a bytearray viewed with the same
+    format, so merges copy between two memoryviews
+    - counting sort writes each value's run with one slice assignment from a
+    repeated array, rather than one element at a time
+
+sort_file sorts a binary file of int64s in place through mmap.
+
+Complexity:
+    insertion_sort_buf: Time O(n^2), Space O(1)
+    counting_sort_buf: Time O(n + k), Space O(n + k) (k counters, runs up to n)
+    merge_sort_buf: Time O(nlogn), Space O(n)
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Union
+from array import array
+import mmap
+from merge_sort import merge_into
+from sort_analytics import test_versions, time_versions
+
+INT_FORMATS = set('bBhHiIlLqQnN')
+RAW_BUFFERS = (bytearray, mmap.mmap) # untyped, so their bytes are read as int64s
+Sortable = Union[List[int], memoryview, Any] # lists or writable buffers
+
+
+def as_view(obj: Sortable) -> Union[List[int], memoryview]:
+    """Get a writable 1-D typed memoryview of obj (lists pass through as is)"""
+    if isinstance(obj, list):
+        return obj
+
+    view = obj if isinstance(obj, memoryview) else memoryview(obj)
+    if view.readonly:
+        raise TypeError("can't sort a read-only buffer in place")
+    if view.ndim != 1:
+        raise ValueError("can only sort 1-D buffers")
+    if isinstance(obj, RAW_BUFFERS): # raw bytes, read them as int64s
+        view = view.cast('B').cast('q')
+
+    return view
+
+
+def _show(lst: Union[List[int], memoryview]) -> List[int]:
+    """Get something printable out of a list or view"""
+    return lst.tolist() if isinstance(lst, memoryview) else lst
+
+
+def insertion_sort_buf(buf: Sortable, prnt: bool=True) -> None:
+    """Sort buf in place by shifting elements rightward, then inserting"""
+    lst = as_view(buf)
+    if prnt:
+        print(f"Insertion Sort Buffer\n\tUnsorted: {_show(lst)}")
+
+    for i in range(1, len(lst)):
+        curr = lst[i]
+        j = i
+        while j >= 1 and lst[j - 1] > curr:
+            lst[j] = lst[j - 1]
+            j -= 1
+
+        lst[j] = curr
+
+    if prnt:
+        print(f"\tSorted: {_show(lst)}")
+
+
+def counting_sort_buf(buf: Sortable, prnt: bool=True) -> None:
+    """Sort buf of ints in place by counting occurrences, then rewriting it"""
+    lst = as_view(buf)
+    if prnt:
+        print(f"Counting Sort Buffer\n\tUnsorted: {_show(lst)}")
+
+    is_view = isinstance(lst, memoryview)
+    if is_view and lst.format not in INT_FORMATS:
+        raise TypeError(f"counting sort needs ints, not format '{lst.format}'")
+
+    if len(lst):
+        lo = min(lst)
+        counts = [0] * (max(lst) - lo + 1)
+        for n in lst:
+            counts[n - lo] += 1
+
+        # rewrite each value's run with one slice assignment
+        idx = 0
+        for i, ct in enumerate(counts):
+            if ct > 0:
+                run = array(lst.format, [i + lo]) if is_view else [i + lo]
+                lst[idx:idx + ct] = run * ct
+                idx += ct
+
+    if prnt:
+        print(f"\tSorted: {_show(lst)}")
+
+
+def merge_sort_buf(buf: Sortable, prnt: bool=True) -> None:
+    """Sort buf in place by merging runs of doubling width, bottom-up"""
+    lst = as_view(buf)
+    if prnt:
+        print(f"Merge Sort Buffer\n\tUnsorted: {_show(lst)}")
+
+    n = len(lst)
+    if n > 1:
+        src = lst
+        if isinstance(lst, memoryview):
+            dst = memoryview(bytearray(lst.nbytes)).cast(lst.format)
+        else:
+            dst = lst[:]
+
+        width = 1
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                merge_into(src, dst, lo, mid, hi)
+
+            src, dst = dst, src
+            width *= 2
+
+        if src is not lst:
+            lst[:] = src
+
+    if prnt:
+        print(f"\tSorted: {_show(lst)}")
+
+
+def sort_file(path: str, version: Callable=merge_sort_buf) -> None:
+    """Sort a binary file of native int64s in place through mmap"""
+    with open(path, 'r+b') as f:
+        if not f.seek(0, 2): # can't mmap an empty file, and it's sorted anyway
+            return
+
+        with mmap.mmap(f.fileno(), 0) as mm:
+            with memoryview(mm) as raw, raw.cast('q') as view:
+                version(view, False)
+            mm.flush()
+
+
+# main
+if __name__ == "__main__":
+    import os
+    import shutil
+    import tempfile
+    from time import perf_counter
+    import corpus
+
+    # analytics (lists go through the same loops)
+    versions = [insertion_sort_buf, counting_sort_buf, merge_sort_buf]
+
+    test_versions(versions) # all valid
+    time_versions(versions)
+
+    # typed byte buffers stay bytes (only bytearray/mmap get read as int64s)
+    for version in versions:
+        buf = array('B', [8, 7, 6, 5, 4, 3, 2, 1, 0])
+        version(buf, False)
+        assert buf.tolist() == list(range(9)), version.__name__
+
+    # list vs buffer path on a file of 10^6 int64s
+    src = corpus.generate('random', 10**6)
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in (counting_sort_buf, merge_sort_buf):
+            path = os.path.join(tmp, "data.bin")
+
+            shutil.copyfile(src, path)
+            start = perf_counter()
+            with open(path, 'rb') as f:
+                lst = array('q', f.read()).tolist()
+            version(lst, False)
+            with open(path, 'wb') as f:
+                array('q', lst).tofile(f)
+            print(f"\t{version.__name__} via list: {perf_counter() - start:.3f} s")
+
+            shutil.copyfile(src, path)
+            start = perf_counter()
+            sort_file(path, version)
+            print(f"\t{version.__name__} via mmap: {perf_counter() - start:.3f} s")
+    # counting_sort_buf via list: 1.547 s (plus ~36 bytes per int of list)
+    # counting_sort_buf via mmap: 1.289 s (no extra memory)
+    # merge_sort_buf via list: 3.582 s
+    # merge_sort_buf via mmap: 4.250 s (one 8 MB buffer instead of 2 lists)
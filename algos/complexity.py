@@ -0,0 +1,230 @@
+"""
+Written by Nat Getahun
+
+Complexity
+----------
+Checks the "Complexity:" section of each module's docstring against what the
+code actually does. Every version is run over a geometric sweep of sizes (random
+ints from corpus, doubling n until a call takes longer than max_call_time or n
+passes max_n), timing each size with benchmark.measure and measuring the peak
+memory of one separate call with tracemalloc.
+
+Claims come from a "<version>: Time O(...), Space O(...)" line if the module
+has one for that version, otherwise from the module's "Time: O(...)" and
+"Space: O(...)" lines.
+
+The times are then fit to each model (n, nlogn, n^2) as t = c * f(n) in log
+space, and whichever model leaves the smallest squared error wins. Peak memory
+is fit the same way against (1, n, nlogn, n^2). If the winner doesn't match the
+claim in the docstring, the version gets flagged. The slope of log(t) against
+log(n) is reported too, as a rough empirical exponent.
+
+Small sizes are dominated by constant overhead, so only sizes >= FIT_MIN_N are
+used for fitting. Memory is only fit from SPACE_FIT_MIN_N up, since CPython's
+cache of small ints makes new int objects free below that. Sweeps that blow the
+recursion limit (or run out of memory) stop there and say so.
+
+Usage:
+    python complexity.py [module:function ...] [--max-n N] [--out results.json]
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Sequence
+from math import log
+import json
+import re
+import sys
+import tracemalloc
+from benchmark import ALL_VERSIONS, as_list, load_versions, make_input, measure, \
+    version_name
+
+MIN_N = 128
+FIT_MIN_N = 256
+SPACE_FIT_MIN_N = 1024 # ints up to 256 are cached, so they cost nothing below
+DEFAULT_MAX_N = 1 << 16
+DEFAULT_MAX_CALL_TIME = 0.25 # seconds
+
+TIME_MODELS: Dict[str, Callable[[int], float]] = {
+    'n': lambda n: n,
+    'nlogn': lambda n: n * log(n),
+    'n^2': lambda n: n * n,
+}
+SPACE_MODELS: Dict[str, Callable[[int], float]] = {
+    '1': lambda n: 1,
+    **TIME_MODELS,
+}
+
+
+# claims
+def claimed(doc: Optional[str], what: str,
+            name: Optional[str]=None) -> Optional[str]:
+    """Get the model a docstring claims for 'Time' or 'Space' (None if unclear)"""
+    doc = doc or ''
+    if name: # a "<name>: Time O(...), Space O(...)" line beats the module's
+        line = re.search(rf"^\s*{re.escape(name)}:(.*)$", doc, re.M)
+        if line:
+            model = _claim(line.group(1), rf"{what}:?\s*O\(")
+            if model:
+                return model
+
+    return _claim(doc, rf"{what}:\s*O\(")
+
+
+def _claim(text: str, pattern: str) -> Optional[str]:
+    """Get the model of the first O(...) that pattern finds in text"""
+    match = re.search(pattern, text)
+    if not match:
+        return None
+
+    # grab everything up to the matching paren, e.g. O(d(n + r))
+    depth = 1
+    end = match.end()
+    while depth and end < len(text):
+        depth += (text[end] == '(') - (text[end] == ')')
+        end += 1
+
+    expr = text[match.end():end - 1].replace(' ', '')
+    if 'n^2' in expr:
+        return 'n^2'
+    if 'logn' in expr:
+        return 'nlogn'
+    if expr == '1':
+        return '1'
+    if 'n' in expr:
+        return 'n'
+    return None
+
+
+# measuring
+def peak_memory(version: Callable, lst: Sequence[int]) -> int:
+    """Get the peak # of bytes allocated during one call of version"""
+    copy = as_list(lst)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        version(copy, False)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def fit(sizes: List[int], values: List[float],
+        models: Dict[str, Callable[[int], float]],
+        min_n: int=FIT_MIN_N) -> Optional[str]:
+    """Get the model that best explains values (in log space)"""
+    points = [(n, max(v, 1e-12)) for n, v in zip(sizes, values) if n >= min_n]
+    if len(points) < 2:
+        return None
+
+    best = None
+    best_err = float('inf')
+    for name, f in models.items():
+        logs = [log(v) - log(f(n)) for n, v in points]
+        c = sum(logs) / len(logs) # log of the best constant
+        err = sum((x - c) ** 2 for x in logs)
+        if err < best_err:
+            best, best_err = name, err
+
+    return best
+
+
+def slope(sizes: List[int], values: List[float],
+          min_n: int=FIT_MIN_N) -> Optional[float]:
+    """Get the least squares slope of log(value) against log(n)"""
+    points = [(log(n), log(max(v, 1e-12))) for n, v in zip(sizes, values)
+              if n >= min_n]
+    if len(points) < 2:
+        return None
+
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    var = sum((x - mx) ** 2 for x, _ in points)
+    return sum((x - mx) * (y - my) for x, y in points) / var
+
+
+def profile(version: Callable, max_n: int=DEFAULT_MAX_N,
+            max_call_time: float=DEFAULT_MAX_CALL_TIME) -> Dict:
+    """Sweep version over doubling sizes and compare the fits to its docstring"""
+    doc = sys.modules[version.__module__].__doc__
+    sizes, times, peaks = [], [], []
+    note = None
+
+    n = MIN_N
+    while n <= max_n:
+        lst = make_input('random', n)
+        try:
+            stats = measure(version, lst, warmup=1, min_time=0.05)
+            peak = peak_memory(version, lst)
+        except (RecursionError, MemoryError, OSError) as e:
+            note = f"stopped at n={n}: {type(e).__name__}"
+            break
+
+        sizes.append(n)
+        times.append(stats.median)
+        peaks.append(peak)
+        if stats.median > max_call_time:
+            break
+        n *= 2
+
+    result = {
+        'version': version_name(version),
+        'claimed_time': claimed(doc, 'Time', version_name(version)),
+        'fitted_time': fit(sizes, times, TIME_MODELS),
+        'time_slope': slope(sizes, times),
+        'claimed_space': claimed(doc, 'Space', version_name(version)),
+        'fitted_space': fit(sizes, peaks, SPACE_MODELS, SPACE_FIT_MIN_N),
+        'space_slope': slope(sizes, peaks, SPACE_FIT_MIN_N),
+        'sizes': sizes,
+        'times': times,
+        'peaks': peaks,
+        'note': note,
+    }
+    result['mismatch'] = any(
+        result[f'claimed_{k}'] and result[f'fitted_{k}']
+        and result[f'claimed_{k}'] != result[f'fitted_{k}']
+        for k in ('time', 'space'))
+
+    return result
+
+
+def print_table(results: List[Dict]) -> None:
+    """Print claimed vs fitted models as a table"""
+    def fmt(model, s):
+        return f"{model or '?'} ({s:.2f})" if s is not None else (model or '?')
+
+    print(f"{'version':<28}{'time claim':>12}{'time fit':>18}"
+          f"{'space claim':>13}{'space fit':>18}")
+    for r in results:
+        flag = '  MISMATCH' if r['mismatch'] else ''
+        print(f"{r['version']:<28}{r['claimed_time'] or '?':>12}"
+              f"{fmt(r['fitted_time'], r['time_slope']):>18}"
+              f"{r['claimed_space'] or '?':>13}"
+              f"{fmt(r['fitted_space'], r['space_slope']):>18}{flag}"
+              f"{'  (' + r['note'] + ')' if r['note'] else ''}")
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    """Command line entry point, returns the exit status"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check documented complexities")
+    parser.add_argument('specs', nargs='*', default=ALL_VERSIONS,
+                        help="versions as module:function")
+    parser.add_argument('--max-n', type=int, default=DEFAULT_MAX_N)
+    parser.add_argument('--max-call-time', type=float,
+                        default=DEFAULT_MAX_CALL_TIME)
+    parser.add_argument('--out', help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [profile(v, args.max_n, args.max_call_time)
+               for v in load_versions(args.specs)]
+    print_table(results)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+# main
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Written by Nat Getahun
+
+Corpus
+------
+Reproducible benchmark inputs. Every dataset is named by its distribution, size,
+seed, and any extra parameters, and gets generated once into a binary file of
+native int64s in the cache dir (DSA_CORPUS_DIR, or a folder in the system temp
+dir). After that, load just memory-maps the file, so even 10^8-element sets are
+never regenerated or held as python lists - sorts get a fresh list copy per run.
+
+Generation streams the values out in fixed-size chunks, so it never needs more
+than one chunk in memory either. Sorted and reversed sets are random walks
+(rather than sorted random data) for the same reason.
+
+Distributions:
+    random: uniform in [0, 10n)
+    sorted: nondecreasing random walk with steps in [0, 20)
+    reversed: nonincreasing random walk with steps in [0, 20)
+    nearly_sorted: sorted, then k random pairs swapped (k = n // 100)
+    few_unique: uniform in [0, unique) (unique = 8)
+    organ_pipe: 0, 1, ..., n/2, ..., 1, 0
+    sawtooth: i % period (period = sqrt(n))
+    wide_outliers: random, but ~rate of values (rate = 0.001) are in +-2**62
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Iterator
+from array import array
+from itertools import islice
+from math import isqrt
+from random import Random
+import mmap
+import os
+import tempfile
+
+CHUNK = 1 << 20 # values generated (and held) at a time
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DSA_CORPUS_DIR', os.path.join(tempfile.gettempdir(), 'dsa-python-corpus'))
+
+
+# distributions (each yields n values)
+def _random(rng: Random, n: int) -> Iterator[int]:
+    hi = max(1, n) * 10
+    return (rng.randrange(hi) for _ in range(n))
+
+
+def _sorted(rng: Random, n: int) -> Iterator[int]:
+    x = 0
+    for _ in range(n):
+        x += rng.randrange(20)
+        yield x
+
+
+def _reversed(rng: Random, n: int) -> Iterator[int]:
+    x = n * 10
+    for _ in range(n):
+        x -= rng.randrange(20)
+        yield x
+
+
+def _few_unique(rng: Random, n: int, unique: int=8) -> Iterator[int]:
+    return (rng.randrange(unique) for _ in range(n))
+
+
+def _organ_pipe(rng: Random, n: int) -> Iterator[int]:
+    return (min(i, n - 1 - i) for i in range(n))
+
+
+def _sawtooth(rng: Random, n: int, period: int=0) -> Iterator[int]:
+    period = period or max(1, isqrt(n))
+    return (i % period for i in range(n))
+
+
+def _wide_outliers(rng: Random, n: int, rate: float=0.001) -> Iterator[int]:
+    hi = max(1, n) * 10
+    for _ in range(n):
+        if rng.random() < rate:
+            yield rng.randrange(-2**62, 2**62)
+        else:
+            yield rng.randrange(hi)
+
+
+DISTS: Dict[str, Callable[..., Iterator[int]]] = {
+    'random': _random,
+    'sorted': _sorted,
+    'reversed': _reversed,
+    'nearly_sorted': _sorted, # swaps happen after the file is written
+    'few_unique': _few_unique,
+    'organ_pipe': _organ_pipe,
+    'sawtooth': _sawtooth,
+    'wide_outliers': _wide_outliers,
+}
+
+
+def dataset_path(dist: str, n: int, seed: int=0,
+                 cache_dir: str=DEFAULT_CACHE_DIR, **params) -> str:
+    """Get the file a dataset lives in (whether or not it's been generated)"""
+    extra = ''.join(f"-{k}{v}" for k, v in sorted(params.items()))
+    return os.path.join(cache_dir, f"{dist}-n{n}-s{seed}{extra}.bin")
+
+
+def generate(dist: str, n: int, seed: int=0, cache_dir: str=DEFAULT_CACHE_DIR,
+             **params) -> str:
+    """Write a dataset to the cache (if it isn't there yet) and get its path"""
+    if dist not in DISTS:
+        raise ValueError(f"unknown distribution: {dist}")
+
+    path = dataset_path(dist, n, seed, cache_dir, **params)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    rng = Random(seed)
+    swaps = params.pop('k', n // 100) if dist == 'nearly_sorted' else 0
+    values = DISTS[dist](rng, n, **params)
+
+    # write to a temp name first so a half-written file is never picked up
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        while True:
+            chunk = array('q', islice(values, CHUNK))
+            if not chunk:
+                break
+            chunk.tofile(f)
+
+    if swaps and n > 1:
+        with open(tmp, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+            with memoryview(mm).cast('q') as buf:
+                for _ in range(swaps):
+                    i = rng.randrange(n)
+                    j = rng.randrange(n)
+                    buf[i], buf[j] = buf[j], buf[i]
+
+    os.replace(tmp, path)
+    return path
+
+
+def load(dist: str, n: int, seed: int=0, cache_dir: str=DEFAULT_CACHE_DIR,
+         **params) -> memoryview:
+    """Memory-map a dataset (generating it first if needed) as a read-only view"""
+    path = generate(dist, n, seed, cache_dir, **params)
+    if n == 0: # can't mmap an empty file
+        return memoryview(array('q')).toreadonly()
+
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return memoryview(mm).cast('q') # the view keeps the mapping alive
+
+
+# main
+if __name__ == "__main__":
+    import sys
+
+    # usage: python corpus.py size [seed] -> generate every distribution
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    for dist in DISTS:
+        print(generate(dist, n, seed))
@@ -12,14 +12,25 @@ to sort a list like [4, 3, 1, 2] by comparing values to one another, we can
 count that each num in [1,4] occurs once, then create a new list containing one
 of each num in [1,4].
 
+The _np versions do the exact same thing with NumPy (min/max, bincount to
+count, repeat to reconstruct), so none of the per-element work happens in the
+interpreter. They take lists or NumPy arrays, hand back whichever they were
+given, and quietly fall back to the plain versions if NumPy isn't installed.
+
 Complexity:
     Time: O(n + k) (k = range of integers in list)
     Space: O(n + k)
 """
 from __future__ import annotations
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import sys
 from sort_analytics import test_versions, time_versions
 
+try:
+    import numpy as np
+except ImportError: # numpy is optional, the _np versions fall back without it
+    np = None
+
 
 def counting_sort(lst: List[int], prnt: bool=True) -> List[int]:
     """Wrapper for _counting_sort that returns new list"""
@@ -31,21 +42,34 @@ def counting_sort_in_place(lst: List[int], prnt: bool=True) -> None:
     _counting_sort(lst, prnt, in_place=True)
 
 
-def _counting_sort(lst: List[int], prnt: bool, in_place: bool) -> Optional[List[int]]:
-    """Sort by counting occurrences of each num then reconstructing the list"""
-    if prnt:
-        print(f"Counting Sort {'In-place' * in_place}\n\tUnsorted: {lst}")
-
-    # get range of integers in list
-    lo = hi = lst[0]
+def _bounds(lst: List[int]) -> Tuple[int, int]:
+    """Get (min, max) of lst in 1 pass ((0, 0) if empty, so 1 unused counter)"""
+    lo = hi = lst[0] if len(lst) else 0
     for n in lst:
         if n > hi:
             hi = n
         elif n < lo:
             lo = n
 
+    return lo, hi
+
+
+def _counting_sort(lst: List[int], prnt: bool, in_place: bool,
+                   bounds: Optional[Tuple[int, int]]=None) -> Optional[List[int]]:
+    """Sort by counting occurrences of each num then reconstructing the list"""
+    if prnt:
+        print(f"Counting Sort {'In-place' * in_place}\n\tUnsorted: {lst}")
+
+    # get range of integers in list, unless the caller already measured it
+    lo, hi = bounds if bounds is not None else _bounds(lst)
+
     # count occurrences of each integer in list
-    counts = [0] * (hi - lo + 1)
+    if hi - lo >= sys.maxsize: # not even a list of counters that long can exist
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count")
+    try:
+        counts = [0] * (hi - lo + 1)
+    except MemoryError: # could exist, just not on this machine
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count") from None
 
     for n in lst:
         counts[n - lo] += 1
@@ -74,17 +98,72 @@ def _counting_sort(lst: List[int], prnt: bool, in_place: bool) -> Optional[List[
         return lst
 
 
+# vectorized methods
+def counting_sort_np(lst: List[int], prnt: bool=True) -> List[int]:
+    """Wrapper for _counting_sort_np that returns new list (or array)"""
+    if np is None:
+        return counting_sort(lst, prnt)
+    return _counting_sort_np(lst, prnt, in_place=False)
+
+
+def counting_sort_in_place_np(lst: List[int], prnt: bool=True) -> None:
+    """Wrapper for _counting_sort_np that sorts 'in place'"""
+    if np is None:
+        counting_sort_in_place(lst, prnt)
+    else:
+        _counting_sort_np(lst, prnt, in_place=True)
+
+
+def _counting_sort_np(lst: List[int], prnt: bool, in_place: bool) -> Optional[List[int]]:
+    """Sort by counting occurrences with bincount then rebuilding with repeat"""
+    if prnt:
+        print(f"Counting Sort NumPy {'In-place' * in_place}\n\tUnsorted: {lst}")
+
+    is_arr = isinstance(lst, np.ndarray)
+    arr = lst if is_arr else np.asarray(lst, dtype=np.int64)
+
+    if arr.size:
+        # get range of integers in list, then count (bincount needs keys >= 0)
+        lo = arr.min()
+        hi = arr.max()
+        keys = arr
+        if arr.dtype.kind == 'i': # so arr - lo can't wrap around to negative
+            if int(hi) - int(lo) > np.iinfo(np.int64).max:
+                raise ValueError(f"range [{lo}, {hi}] is too wide to count")
+            keys = arr.astype(np.int64, copy=False)
+        counts = np.bincount(keys - lo, minlength=int(hi) - int(lo) + 1)
+
+        # reconstruct list
+        arr = np.repeat(np.arange(int(lo), int(hi) + 1, dtype=arr.dtype), counts)
+
+    if not is_arr:
+        arr = arr.tolist()
+
+    if prnt:
+        print(f"\tSorted: {arr}")
+
+    if in_place:
+        lst[:] = arr
+    else:
+        return arr
+
+
 # main
 if __name__ == "__main__":
     # analytics
-    versions = [counting_sort, counting_sort_in_place]
+    versions = [counting_sort, counting_sort_in_place,
+                counting_sort_np, counting_sort_in_place_np]
 
     test_versions(versions) # valid
     time_versions(versions)
     # short:
-    #    counting_sort: 4.642 µs
-    #    counting_sort_in_place: 5.404 µs
+    #    counting_sort: 6.859 µs
+    #    counting_sort_in_place: 8.020 µs
+    #    counting_sort_np: 13.758 µs (numpy call overhead wins on tiny lists)
+    #    counting_sort_in_place_np: 18.404 µs
     #
     # long:
-    #    counting_sort: 415.566 µs (kinda nutty)
-    #    counting_sort_in_place: 447.992 µs
\ No newline at end of file
+    #    counting_sort: 603.816 µs (kinda nutty)
+    #    counting_sort_in_place: 646.007 µs
+    #    counting_sort_np: 76.537 µs
+    #    counting_sort_in_place_np: 92.723 µs
\ No newline at end of file
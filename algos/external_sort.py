@@ -0,0 +1,192 @@
+"""
+Written by Nat Getahun
+
+External Merge Sort
+-------------------
+For when the list doesn't fit in memory. The input is a binary file of native
+signed 64-bit ints, which we read in chunks that do fit in our memory budget.
+Each chunk is read straight into an array('q') and sorted there with the buffer
+merge sort, so the ints never get boxed into a list (~36 bytes each instead of
+8), then spilled to a temp file as a sorted "run". Once the whole input has been
+split into runs, we k-way merge them: a heap holds the current front element of
+every run, so the smallest remaining element overall is always at the top. Pop
+it, write it out, and replace it with the next element from the run it came
+from.
+
+Everything counts against the memory budget:
+    - spilling holds a chunk and the merge sort's buffer of the same size, so
+    chunks are memory // 16 ints
+    - merging holds one read block per run being merged and one write block.
+    Files are unbuffered, so those blocks are the only I/O buffers, and each is
+    at least buffer_size bytes. That caps how many runs get merged at once
+    (fan-in), and so does MAX_FAN_IN, to stay well under the open file limit.
+    With more runs than that, groups of them are merged into longer runs first,
+    pass after pass, until one last merge can write the output
+
+The disk still sees big sequential I/O rather than one syscall per int.
+
+Cases:
+    Input is empty: output is empty
+    Input fits in 1 chunk: 1 run, and the "merge" is just a blocked copy
+    Input is bigger: - read, sort, and spill chunks of memory // 16 ints
+                     - merge groups of fan-in runs until there are few enough
+                     - k-way merge the rest into the output with a heap
+
+Complexity:
+    Time: O(nlogn) (plus 1 + log_f(# of runs) full reads and writes, f = fan-in)
+    Space: O(m) in memory (m = memory budget), O(n) on disk for the runs
+"""
+from __future__ import annotations
+from typing import BinaryIO, Iterator, List
+from array import array
+import heapq
+import os
+import tempfile
+from buffer_sort import merge_sort_buf
+from sort_analytics import test_versions, time_versions
+
+ITEM_SIZE = array('q').itemsize
+DEFAULT_MEMORY = 64 << 20 # bytes
+DEFAULT_BUFFER = 1 << 20 # bytes, smallest read/write block while merging
+MAX_FAN_IN = 64 # runs open at once
+
+
+def external_sort(src_path: str, dst_path: str, memory: int=DEFAULT_MEMORY,
+                  buffer_size: int=DEFAULT_BUFFER) -> None:
+    """Sort the int64s in src_path into dst_path using ~memory bytes of RAM"""
+    if os.path.getsize(src_path) % ITEM_SIZE:
+        raise ValueError(f"{src_path} isn't a whole # of {ITEM_SIZE}-byte ints")
+
+    fan_in = max(2, min(MAX_FAN_IN, memory // max(buffer_size, 1) - 1))
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = _spill_runs(src_path, tmp, max(1, memory // (2 * ITEM_SIZE)))
+
+        passes = 0
+        while len(runs) > fan_in: # merge groups into longer runs first
+            merged = []
+            for lo in range(0, len(runs), fan_in):
+                path = os.path.join(tmp, f"pass{passes}_run{len(merged)}.bin")
+                _merge_runs(runs[lo:lo + fan_in], path, memory)
+                merged.append(path)
+            runs = merged
+            passes += 1
+
+        _merge_runs(runs, dst_path, memory)
+
+
+def external_sort_lst(lst: List[int], prnt: bool=True) -> None:
+    """Round-trip lst through temp files for testing (tiny memory budget)"""
+    if prnt:
+        print(f"External Sort\n\tUnsorted: {lst}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.bin")
+        dst = os.path.join(tmp, "out.bin")
+        with open(src, 'wb') as f:
+            array('q', lst).tofile(f)
+
+        # forces several runs, and several merge passes (fan-in 3)
+        external_sort(src, dst, memory=64 * ITEM_SIZE,
+                      buffer_size=16 * ITEM_SIZE)
+
+        with open(dst, 'rb') as f:
+            lst[:] = array('q', f.read()).tolist()
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def _spill_runs(src_path: str, tmp: str, chunk_items: int) -> List[str]:
+    """Split src_path into sorted run files in tmp and return their paths"""
+    runs = []
+    chunk = array('q', bytes(chunk_items * ITEM_SIZE)) # reused for every chunk
+    with open(src_path, 'rb', buffering=0) as f, memoryview(chunk) as view:
+        while True:
+            got = _read_items(f, view)
+            if not got:
+                break
+
+            merge_sort_buf(view[:got], False)
+
+            path = os.path.join(tmp, f"run{len(runs)}.bin")
+            with open(path, 'wb', buffering=0) as run:
+                run.write(view[:got])
+            runs.append(path)
+
+    return runs
+
+
+def _merge_runs(runs: List[str], dst_path: str, memory: int) -> None:
+    """K-way merge the sorted run files into dst_path, deleting them after"""
+    block_items = max(1, memory // ITEM_SIZE // (len(runs) + 1))
+    files = [open(path, 'rb', buffering=0) for path in runs]
+    try:
+        readers = [_read_blocks(f, block_items) for f in files]
+
+        # (front element, run #) for every nonempty run
+        heap = []
+        for idx, reader in enumerate(readers):
+            first = next(reader, None)
+            if first is not None:
+                heap.append((first, idx))
+        heapq.heapify(heap)
+
+        out = array('q')
+        with open(dst_path, 'wb', buffering=0) as f:
+            while heap:
+                n, idx = heap[0]
+                out.append(n)
+                if len(out) >= block_items:
+                    f.write(out)
+                    del out[:]
+
+                nxt = next(readers[idx], None)
+                if nxt is None:
+                    heapq.heappop(heap)
+                else:
+                    heapq.heapreplace(heap, (nxt, idx))
+
+            f.write(out)
+    finally:
+        for f in files:
+            f.close()
+
+    for path in runs: # only needed until they're merged, so disk stays O(n)
+        os.remove(path)
+
+
+def _read_blocks(f: BinaryIO, block_items: int) -> Iterator[int]:
+    """Yield the ints in f, reading block_items of them at a time"""
+    block = array('q', bytes(block_items * ITEM_SIZE)) # reused for every read
+    with memoryview(block) as view:
+        while True:
+            got = _read_items(f, view)
+            if not got:
+                return
+            yield from view[:got]
+
+
+def _read_items(f: BinaryIO, view: memoryview) -> int:
+    """Fill view from f (short of EOF), get the # of whole ints read into it"""
+    raw = view.cast('B')
+    filled = 0
+    while filled < len(raw): # unbuffered reads can come back short
+        got = f.readinto(raw[filled:])
+        if not got:
+            break
+        filled += got
+
+    if filled % ITEM_SIZE:
+        raise ValueError(f"{f.name} ends partway through a {ITEM_SIZE}-byte int")
+    return filled // ITEM_SIZE
+
+
+# main
+if __name__ == "__main__":
+    # analytics
+    versions = [external_sort_lst]
+
+    test_versions(versions) # valid
+    time_versions(versions)
+    # short: 667.037 µs (mostly temp file churn)
+    # long: 6.343 ms (32 runs of 32 ints, merged 3 at a time over 4 passes)
@@ -0,0 +1,269 @@
+"""
+Written by Nat Getahun
+
+Fuzz
+----
+Differential fuzzing: every registered version gets run on thousands of random
+lists and checked against sorted(), which is trusted to be right. Each case is
+built from its own seed, so any failure can be regenerated from just that
+seed, and the cases are deliberately nasty: empty and 1-element lists, all
+duplicates, a handful of distinct values, negatives, already sorted or reversed,
+and huge ranges (up to +-2**62). Most lists are short, since that's where the
+edge cases live and it keeps throughput up, with the odd longer one.
+
+The parallel sorts only leave their sequential fallbacks above a cutoff far
+bigger than any case, so they're fuzzed through wrappers (the *_pool versions
+below) that set cutoff=0 and use 2-4 workers, depending on the case. The pairs
+version is also checked for stability. Starting a pool for every call is slow,
+so those only get POOL_CASES cases each.
+
+Versions are split into chunks of seeds and spread across a process pool. A
+case fails if the version raises or if what it leaves behind (or returns, for
+versions that return a new list) isn't sorted(case). Some versions only accept
+part of the input space - counting sorts need one counter per value in the
+range - so cases outside a version's documented limits (MAX_SPAN) are skipped
+for it rather than failed.
+
+The first failure for each version is then shrunk to a minimal case: chunks of
+the list (halves, then quarters, ...) are dropped while it still fails, then
+each value is pulled towards 0 while it still fails.
+
+Usage:
+    python fuzz.py [module:function ...] [--cases N] [--seed S] [--workers W]
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+import os
+import sys
+from benchmark import ALL_VERSIONS, load_versions, version_name
+from parallel_counting_sort import parallel_counting_sort, \
+    parallel_counting_sort_pairs
+from parallel_merge_sort import parallel_merge_sort
+
+DEFAULT_CASES = 2000 # per version
+POOL_CASES = 200 # per version that starts its own pool on every call
+DEFAULT_SEED = 0
+CHUNK = 250 # cases per pool task
+MAX_N = 300
+MAX_SHRINK_STEPS = 2000
+
+POOL_VERSIONS = [
+    'fuzz:parallel_merge_sort_pool',
+    'fuzz:parallel_counting_sort_pool',
+    'fuzz:parallel_counting_sort_pairs_pool',
+]
+DEFAULT_SPECS = ALL_VERSIONS + POOL_VERSIONS
+
+# versions that allocate one counter per value in the range
+MAX_SPAN: Dict[str, int] = {
+    'counting_sort': 1 << 16,
+    'counting_sort_in_place': 1 << 16,
+    'counting_sort_np': 1 << 16,
+    'counting_sort_in_place_np': 1 << 16,
+    'parallel_counting_sort': 1 << 16,
+    'counting_sort_buf': 1 << 16,
+    'parallel_counting_sort_pool': 1 << 16,
+    'parallel_counting_sort_pairs_pool': 1 << 16,
+}
+
+Failure = Tuple[int, List[int], str] # (seed, case, what went wrong)
+
+
+# cases
+def make_case(seed: int) -> List[int]:
+    """Build the random list for seed"""
+    rng = Random(seed)
+    roll = rng.random()
+    if roll < 0.5:
+        n = rng.randint(0, 8)
+    elif roll < 0.85:
+        n = rng.randint(9, 64)
+    else:
+        n = rng.randint(65, MAX_N)
+
+    shape = rng.choice(('small', 'negative', 'dups', 'equal', 'huge', 'mixed'))
+    if shape == 'small':
+        lst = [rng.randint(0, 100) for _ in range(n)]
+    elif shape == 'negative':
+        lst = [rng.randint(-1000, 1000) for _ in range(n)]
+    elif shape == 'dups':
+        values = [rng.randint(-50, 50) for _ in range(rng.randint(1, 4))]
+        lst = [rng.choice(values) for _ in range(n)]
+    elif shape == 'equal':
+        lst = [rng.randint(-5, 5)] * n
+    elif shape == 'huge':
+        lst = [rng.randint(-2**62, 2**62) for _ in range(n)]
+    else: # small values with the odd huge outlier
+        lst = [rng.randint(-20, 20) if rng.random() < 0.9
+               else rng.randint(-2**62, 2**62) for _ in range(n)]
+
+    order = rng.random()
+    if order < 0.1:
+        lst.sort()
+    elif order < 0.2:
+        lst.sort(reverse=True)
+
+    return lst
+
+
+# parallel versions with their parallel paths forced on
+def _pool_workers(lst: List[int]) -> int:
+    """Get 2-4 workers, varying with the case so chunks split unevenly too"""
+    return 2 + len(lst) % 3
+
+
+def parallel_merge_sort_pool(lst: List[int], prnt: bool=True) -> None:
+    """parallel_merge_sort with no cutoff"""
+    parallel_merge_sort(lst, prnt, workers=_pool_workers(lst), cutoff=0)
+
+
+def parallel_counting_sort_pool(lst: List[int], prnt: bool=True) -> None:
+    """parallel_counting_sort with no cutoff"""
+    parallel_counting_sort(lst, prnt, workers=_pool_workers(lst), cutoff=0)
+
+
+def parallel_counting_sort_pairs_pool(lst: List[int], prnt: bool=True) -> None:
+    """parallel_counting_sort_pairs with no cutoff, on (key, position) pairs"""
+    pairs = [(key, i) for i, key in enumerate(lst)]
+    parallel_counting_sort_pairs(pairs, prnt, workers=_pool_workers(lst),
+                                 cutoff=0)
+    if pairs != sorted(pairs): # positions must stay in order among equal keys
+        raise AssertionError(f"unstable or unsorted pairs: {pairs}")
+    lst[:] = [key for key, _ in pairs]
+
+
+# checking
+def check(version: Callable, case: List[int]) -> Optional[str]:
+    """Get what version did wrong on case (None if right, or out of its limits)"""
+    span = MAX_SPAN.get(version_name(version))
+    if span is not None and case and max(case) - min(case) > span:
+        return None
+
+    lst = case[:]
+    try:
+        return_val = version(lst, False)
+    except Exception as e:
+        return f"raised {type(e).__name__}: {e}"
+
+    out = lst if return_val is None else return_val # returned a sorted copy
+    if not isinstance(out, list) and hasattr(out, 'tolist'):
+        out = out.tolist()
+    expected = sorted(case)
+    if out != expected:
+        return f"gave {out}, expected {expected}"
+    return None
+
+
+def shrink(version: Callable, case: List[int]) -> List[int]:
+    """Cut case down to a minimal list that still fails"""
+    steps = 0
+
+    def fails(lst):
+        nonlocal steps
+        steps += 1
+        return check(version, lst) is not None
+
+    # drop chunks of shrinking size
+    size = len(case) // 2
+    while size and steps < MAX_SHRINK_STEPS:
+        i = 0
+        while i < len(case) and steps < MAX_SHRINK_STEPS:
+            smaller = case[:i] + case[i + size:]
+            if fails(smaller):
+                case = smaller
+            else:
+                i += size
+        size //= 2
+
+    # pull values towards 0
+    changed = True
+    while changed and steps < MAX_SHRINK_STEPS:
+        changed = False
+        for i, n in enumerate(case):
+            for simpler in (0, n // 2, n - 1 if n > 0 else n + 1):
+                if abs(simpler) < abs(n):
+                    attempt = case[:i] + [simpler] + case[i + 1:]
+                    if fails(attempt):
+                        case = attempt
+                        changed = True
+                        break
+
+    return case
+
+
+# worker function (module level so it can be sent to the pool)
+def _fuzz_chunk(spec: str, seeds: range) -> Tuple[int, Optional[Failure]]:
+    """Run spec on every seed's case, get # run and the first failure"""
+    version = load_versions([spec])[0]
+    for seed in seeds:
+        case = make_case(seed)
+        problem = check(version, case)
+        if problem:
+            return seed - seeds.start + 1, (seed, case, problem)
+
+    return len(seeds), None
+
+
+def fuzz(specs: List[str], cases: int=DEFAULT_CASES, seed: int=DEFAULT_SEED,
+         workers: Optional[int]=None) -> Dict[str, Optional[Failure]]:
+    """Fuzz every spec, get each one's first (shrunk) failure or None"""
+    tasks = []
+    for spec in specs:
+        n = min(cases, POOL_CASES) if spec in POOL_VERSIONS else cases
+        tasks.extend((spec, range(lo, min(lo + CHUNK, seed + n)))
+                     for lo in range(seed, seed + n, CHUNK))
+    first: Dict[str, Optional[Failure]] = {spec: None for spec in specs}
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        for (spec, _), (_, failure) in zip(tasks, pool.map(_fuzz_chunk,
+                                                            *zip(*tasks))):
+            if failure and (first[spec] is None or failure[0] < first[spec][0]):
+                first[spec] = failure
+
+    for spec, failure in first.items():
+        if failure:
+            version = load_versions([spec])[0]
+            small = shrink(version, failure[1])
+            first[spec] = (failure[0], small, check(version, small))
+
+    return first
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    """Command line entry point, returns the exit status"""
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Fuzz sorting versions")
+    parser.add_argument('specs', nargs='*', default=DEFAULT_SPECS,
+                        help="versions as module:function")
+    parser.add_argument('--cases', type=int, default=DEFAULT_CASES,
+                        help="cases per version")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    results = fuzz(args.specs, args.cases, args.seed, args.workers)
+    elapsed = perf_counter() - start
+
+    total = 0
+    for spec, failure in results.items():
+        name = spec.partition(':')[2]
+        cases = min(args.cases, POOL_CASES) if spec in POOL_VERSIONS else args.cases
+        total += cases
+        if failure:
+            seed, case, problem = failure
+            print(f"\t{name}: FAILED (seed {seed})\n\t\tminimal case: {case}"
+                  f"\n\t\t{problem}")
+        else:
+            print(f"\t{name}: {cases} cases passed")
+
+    print(f"{total} cases in {elapsed:.1f} s ({total / elapsed:,.0f} cases/s)")
+    return 1 if any(results.values()) else 0
+
+
+# main
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Written by Nat Getahun
+
+Hybrid Sort
+-----------
+None of the other sorts win everywhere: insertion sort is unbeatable on tiny
+lists, counting sort is unbeatable when the values are packed into a narrow
+range, radix sort when they're spread over a wider one, and merge sort is the
+safe bet for everything else. This sort takes a quick look at the list first and
+hands it to whichever of those should win.
+
+Looking has to be cheap, so it's done on a fixed-size sample rather than the
+whole list:
+    - every (n / SAMPLE_SIZE)th item, which keeps the list's long-range shape,
+    so its types, rough range, and how often it changes direction (~2 times per
+    run boundary) estimate the whole list's. A sample that's all ascending or all
+    descending is then checked against the whole list, which stops at the
+    first pair that breaks it
+    - WINDOWS contiguous stretches of WINDOW items, which the stride skips
+    over. Lists that are in order at a distance can still be shuffled up close
+    (descending runs broken by ties, local swaps), and merge sort only wins if
+    every window changes direction at most twice
+The only full pass before sorting is the exact range, and only for int lists
+headed to counting or radix sort, which take it as their bounds instead of
+measuring it again.
+
+When merge sort wins, it's a natural (Timsort-style) merge sort rather than the
+plain one: instead of starting from runs of length 1, it scans for the runs that
+already exist in the list (reversing strictly descending ones in place, which
+keeps equal elements in order), stretches any run shorter than MIN_RUN with
+insertion sort, then merges neighbouring runs bottom-up with one buffer. Already
+sorted, reversed, or mostly-ordered lists end up with very few runs to merge.
+
+The decision is exposed through plan_sort so it can be inspected without sorting
+anything.
+
+Cases:
+    List is small (<= SMALL_N): insertion sort (O(n) if it's already sorted)
+    List is sorted: nothing to do
+    List is strictly descending: reverse it
+    List is a few long runs: natural merge sort (<= MERGE_RUNS_COUNTING of
+    them in a narrow range, <= MERGE_RUNS_RADIX in a wider one)
+    List is all ints in a narrow range: counting sort
+    List is all ints in a range of <= RADIX_MAX_BITS bits: radix sort
+    Otherwise: natural merge sort
+
+Counting and radix sort rebuild their values, so int subclasses (bool) come back
+as plain ints. Non-ints the sample missed make them raise before they write
+anything, and the list gets merge sorted instead.
+
+Complexity:
+    Time: O(nlogn) (O(n) for sorted/reversed lists, O(n + k) for narrow ranges,
+    O(dn) for ranges of d bytes)
+    Space: O(n)
+"""
+from __future__ import annotations
+from typing import List, NamedTuple, Optional
+from itertools import islice
+from operator import gt, le, ne
+from counting_sort import _bounds, _counting_sort
+from insertion_sort import insertion_sort_itr1
+from merge_sort import merge_into
+from radix_sort import _radix_sort
+from sort_analytics import test_versions, time_versions
+
+SMALL_N = 64
+MIN_RUN = 32
+COUNTING_FACTOR = 8 # counting sort if range <= COUNTING_FACTOR * n, else radix
+MAX_COUNTING_RANGE = 1 << 22
+RADIX_MAX_BITS = 32 # wider ranges take too many passes to beat merging
+MERGE_RUNS_COUNTING = 2 # merging more runs than this loses to counting sort
+MERGE_RUNS_RADIX = 16 # and more than this loses to radix sort
+SAMPLE_SIZE = 256 # plenty to tell <= MERGE_RUNS_RADIX runs from more
+WINDOWS = 16
+WINDOW = 64
+
+
+class SortPlan(NamedTuple):
+    algo: str # 'none', 'reverse', 'insertion', 'counting', 'radix', or
+              # 'natural_merge'
+    n: int
+    lo: Optional[int] = None # exact, but only measured for counting/radix
+    hi: Optional[int] = None
+    runs: Optional[int] = None # estimated from the sample
+
+
+def plan_sort(lst: List[int]) -> SortPlan:
+    """Sample lst and decide which algorithm hybrid_sort would use on it"""
+    n = len(lst)
+    if n < 2:
+        return SortPlan('none', n)
+    if n <= SMALL_N: # measuring would cost more than just sorting
+        return SortPlan('insertion', n)
+
+    # every measurement of the sample runs in C (map/sum/set/min/max)
+    sample = lst[::-(-n // SAMPLE_SIZE)]
+    descents = list(map(gt, sample, islice(sample, 1, None)))
+    if not any(descents) and all(map(le, lst, islice(lst, 1, None))):
+        return SortPlan('none', n)
+    if all(descents) and all(map(gt, lst, islice(lst, 1, None))):
+        return SortPlan('reverse', n)
+
+    turns = sum(map(ne, descents, islice(descents, 1, None)))
+    runs = (turns + 1) // 2 + 1
+    if set(map(type, sample)) != {int}:
+        return SortPlan('natural_merge', n, runs=runs)
+    if runs <= MERGE_RUNS_RADIX: # few enough that merging might win
+        narrow = max(sample) - min(sample) <= COUNTING_FACTOR * n
+        if (runs <= (MERGE_RUNS_COUNTING if narrow else MERGE_RUNS_RADIX)
+                and _ordered_up_close(lst)):
+            return SortPlan('natural_merge', n, runs=runs)
+
+    lo, hi = _bounds(lst)
+    if type(lo) is not int or type(hi) is not int:
+        algo = 'natural_merge'
+    elif hi - lo <= min(COUNTING_FACTOR * n, MAX_COUNTING_RANGE):
+        algo = 'counting'
+    elif (hi - lo).bit_length() <= RADIX_MAX_BITS:
+        algo = 'radix'
+    else:
+        algo = 'natural_merge'
+
+    return SortPlan(algo, n, lo, hi, runs)
+
+
+def _ordered_up_close(lst: List[int]) -> bool:
+    """Check that every sampled window changes direction at most twice"""
+    step = max(WINDOW, len(lst) // WINDOWS)
+    for lo in range(0, len(lst) - 1, step):
+        window = lst[lo:lo + WINDOW]
+        descents = list(map(gt, window, islice(window, 1, None)))
+        if sum(map(ne, descents, islice(descents, 1, None))) > 2:
+            return False
+
+    return True
+
+
+def hybrid_sort(lst: List[int], prnt: bool=True) -> None:
+    """Sort in place with whichever algorithm plan_sort picks"""
+    if prnt:
+        print(f"Hybrid Sort\n\tUnsorted: {lst}")
+
+    plan = plan_sort(lst)
+    if plan.algo == 'reverse':
+        lst.reverse()
+    elif plan.algo == 'insertion':
+        insertion_sort_itr1(lst, False)
+    elif plan.algo in ('counting', 'radix'):
+        try:
+            if plan.algo == 'counting':
+                _counting_sort(lst, False, in_place=True,
+                               bounds=(plan.lo, plan.hi))
+            else:
+                _radix_sort(lst, 8, bounds=(plan.lo, plan.hi))
+        except TypeError: # a non-int the sample missed, lst is untouched
+            _natural_merge_sort(lst)
+    elif plan.algo == 'natural_merge':
+        _natural_merge_sort(lst)
+
+    if prnt:
+        print(f"\tPlan: {plan}\n\tSorted: {lst}")
+
+
+def _natural_merge_sort(lst: List[int]) -> None:
+    """Sort in place by finding existing runs, then merging them bottom-up"""
+    n = len(lst)
+
+    # split into runs of at least MIN_RUN (bounds[k]:bounds[k + 1] is sorted)
+    bounds = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and lst[hi] < lst[lo]: # strictly descending, so flip it
+            while hi + 1 < n and lst[hi + 1] < lst[hi]:
+                hi += 1
+            hi += 1
+            lst[lo:hi] = lst[lo:hi][::-1]
+        else:
+            while hi < n and not lst[hi] < lst[hi - 1]:
+                hi += 1
+
+        end = min(lo + MIN_RUN, n)
+        if hi < end:
+            _insertion_sort_range(lst, lo, end, hi)
+            hi = end
+
+        bounds.append(hi)
+        lo = hi
+
+    if len(bounds) <= 2:
+        return
+
+    # merge neighbouring runs until only one is left
+    src = lst
+    dst = lst[:]
+    while len(bounds) > 2:
+        merged = [0]
+        for k in range(0, len(bounds) - 1, 2):
+            lo, mid = bounds[k], bounds[k + 1]
+            hi = bounds[k + 2] if k + 2 < len(bounds) else mid
+            merge_into(src, dst, lo, mid, hi)
+            merged.append(hi)
+
+        bounds = merged
+        src, dst = dst, src
+
+    if src is not lst:
+        lst[:] = src
+
+
+def _insertion_sort_range(lst: List[int], lo: int, hi: int, start: int) -> None:
+    """Insertion sort lst[lo:hi], given that lst[lo:start] is already sorted"""
+    for i in range(start, hi):
+        curr = lst[i]
+        j = i
+        while j > lo and lst[j - 1] > curr:
+            lst[j] = lst[j - 1]
+            j -= 1
+
+        lst[j] = curr
+
+
+# main
+if __name__ == "__main__":
+    from sort_analytics import DEFAULT_UNSORTED_LIST, DEFAULT_UNSORTED_LIST_LONG
+
+    # decisions on the default corpus
+    for lst in (DEFAULT_UNSORTED_LIST, DEFAULT_UNSORTED_LIST_LONG):
+        print(plan_sort(lst))
+        print(plan_sort(sorted(lst)[::-1]))
+
+    # analytics
+    versions = [hybrid_sort]
+
+    test_versions(versions) # valid
+    time_versions(versions)
+    # short: 3.654 µs (insertion_sort_itr1 on its own: 3.230 µs)
+    #
+    # long: 377.208 µs (range is ~10n, so radix: radix_sort on its own: 365.3
+    # µs, counting_sort_in_place: 499.3 µs; merge_sort_itr: 1.378 ms,
+    # insertion_sort_itr1: 12.282 ms)
+    #
+    # corpus, n = 20000 (best single algorithm on its own):
+    #     random: 10.53 ms (radix_sort: 10.68 ms)
+    #     sorted: 0.51 ms (natural merge: 0.85 ms)
+    #     few_unique: 1.36 ms (counting_sort_in_place: 1.38 ms)
+    #     organ_pipe: 2.22 ms (natural merge: 2.10 ms, counting: 2.82 ms)
+    #     sawtooth: 1.26 ms (counting_sort_in_place: 1.23 ms)
+    #     wide_outliers: 22.99 ms (natural merge: 22.96 ms, radix_sort: 29.78 ms)
+    # planning is the sample plus 1 range pass, so at n = 10^5 few_unique takes
+    # 7.1-8.9 ms, the same as counting_sort_in_place (7.1-9.1 ms)
@@ -22,14 +22,35 @@ Cases:
                           - if sorting in nondecreasing order, this process
                           shifts all elements in S that are > N rightward
 
+The recursive version used to slice out a new list at every step and recurse
+once per element, so it hit the recursion limit at ~1000 elements. It now sorts
+one copy of the list in place and returns it, with the recursion unwound into a
+loop (same order of insertions). insert_rcr, which builds a new list with the
+element inserted, is unchanged; the sort uses the in-place _insert_rcr_at.
+
+Two more modes cut down the work of finding where each element goes:
+    - binary_insertion_sort binary searches the sorted section for the slot,
+    then moves everything after it over in one slice assignment, so it does
+    O(logn) comparisons per element and the shifting happens in C
+    - shell_sort insertion sorts elements gap apart for a shrinking sequence of
+    gaps (Ciura's or Sedgewick's), ending with gap 1. Early passes move
+    elements far in one step, so the final pass has almost nothing left to do.
+    It isn't stable.
+
 Complexity:
     Time: O(n^2) (O(n) for sorted list)
     Space: O(1)
+    insertion_sort_rcr: Time O(n^2), Space O(n) (returns a sorted copy)
+    binary_insertion_sort: Time O(n^2) (O(nlogn) comparisons), Space O(n)
+    shell_sort: Time O(nlogn) measured (no proven bound for Ciura's), Space O(1)
+    shell_sort_sedgewick: Time O(nlogn) measured (O(n^(4/3)) worst), Space O(1)
 """
 # ------------------------------------------------------------------------------
 from __future__ import annotations
-from typing import List
+from typing import Callable, Dict, List
+from bisect import bisect_right
 from sort_analytics import test_versions, time_versions, DEFAULT_UNSORTED_LIST
+from sort_trace import SortTrace, PASS, MOVE, LIFT, DROP, render
 
 
 # recursive method
@@ -38,7 +59,8 @@ def insertion_sort_rcr(lst: List[int], prnt: bool=True) -> List[int]:
     if prnt:
         print(f"Recursive Version\n\tUnsorted: {lst}")
 
-    lst = _insertion_sort_rcr(lst)
+    lst = lst[:] # leave the caller's list alone, like it always has
+    _insertion_sort_rcr(lst, len(lst))
 
     if prnt:
         print(f"\tSorted: {lst}")
@@ -46,15 +68,15 @@ def insertion_sort_rcr(lst: List[int], prnt: bool=True) -> List[int]:
     return lst
 
 
-def _insertion_sort_rcr(lst: List[int]) -> List[int]:
-    """Sort by inserting elements into progressively lengthening sorted lst"""
-    if len(lst) < 2:
-        return lst
-
-    return insert_rcr(_insertion_sort_rcr(lst[:-1]), lst[-1])
+def _insertion_sort_rcr(lst: List[int], n: int) -> None:
+    """Sort lst[:n] in place by sorting lst[:n - 1], then inserting lst[n - 1]"""
+    # the recursion bottoms out at lst[:1] and inserts on the way back up, so
+    # unwinding it is the same work in the same order, minus n stack frames
+    for end in range(1, n):
+        _insert_rcr_at(lst, end)
 
 
-def insert_rcr(lst: List[int], element: int) -> None:
+def insert_rcr(lst: List[int], element: int) -> List[int]:
     """Insert element into lst (assumed to be sorted)"""
     if not lst:
         return [element]
@@ -65,6 +87,18 @@ def insert_rcr(lst: List[int], element: int) -> None:
     return lst[:1] + insert_rcr(lst[1:], element)
 
 
+def _insert_rcr_at(lst: List[int], i: int) -> None:
+    """Insert lst[i] into lst[:i] (assumed to be sorted), in place"""
+    element = lst[i]
+    j = 0
+    while j < i and not element < lst[j]: # goes after equal elements
+        j += 1
+
+    for k in range(i, j, -1):
+        lst[k] = lst[k - 1]
+    lst[j] = element
+
+
 # iterative methods
 def insertion_sort_itr1(lst: List[int], prnt: bool=True) -> None:
     """Sort by shifting elements rightward, then inserting current element"""
@@ -101,22 +135,100 @@ def insertion_sort_itr2(lst: List[int], prnt: bool=True) -> None:
         print(f"\tSorted: {lst}")
 
 
-def insertion_sort_itr_visualizer(lst: List[int]) -> None:
-    print(f"Visualizer\n\tUnsorted: {lst}\n")
+def binary_insertion_sort(lst: List[int], prnt: bool=True) -> None:
+    """Sort by binary searching for each element's slot, then shifting once"""
+    if prnt:
+        print(f"Binary Insertion Sort\n\tUnsorted: {lst}")
+
+    for i in range(1, len(lst)):
+        curr = lst[i]
+        j = bisect_right(lst, curr, 0, i) # after equal elements, so stable
+        if j < i:
+            lst[j + 1:i + 1] = lst[j:i]
+            lst[j] = curr
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+# shell sort
+def ciura_gaps(n: int) -> List[int]:
+    """Get Ciura's gaps below n (extended by * 2.25 past 1750), largest first"""
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+    while gaps[-1] < n:
+        gaps.append(int(gaps[-1] * 2.25))
+
+    return [gap for gap in reversed(gaps) if gap < n] or [1]
+
+
+def sedgewick_gaps(n: int) -> List[int]:
+    """Get Sedgewick's 4^k + 3 * 2^(k - 1) + 1 gaps below n, largest first"""
+    gaps = [1]
+    k = 1
+    while 4 ** k + 3 * 2 ** (k - 1) + 1 < n:
+        gaps.append(4 ** k + 3 * 2 ** (k - 1) + 1)
+        k += 1
+
+    return gaps[::-1]
+
+
+GAPS: Dict[str, Callable[[int], List[int]]] = {
+    'ciura': ciura_gaps,
+    'sedgewick': sedgewick_gaps,
+}
+
+
+def shell_sort(lst: List[int], prnt: bool=True, gaps: str='ciura') -> None:
+    """Sort by insertion sorting every gap-th element, for shrinking gaps"""
+    if prnt:
+        print(f"Shell Sort ({gaps})\n\tUnsorted: {lst}")
+
+    for gap in GAPS[gaps](len(lst)):
+        for i in range(gap, len(lst)):
+            curr = lst[i]
+            j = i
+            while j >= gap and lst[j - gap] > curr:
+                lst[j] = lst[j - gap]
+                j -= gap
+
+            lst[j] = curr
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def shell_sort_sedgewick(lst: List[int], prnt: bool=True) -> None:
+    """Shell sort with Sedgewick's gaps"""
+    shell_sort(lst, prnt, gaps='sedgewick')
+
+
+def insertion_sort_traced(lst: List[int]) -> SortTrace:
+    """Sort like insertion_sort_itr1, recording every shift into a trace"""
+    trace = SortTrace(lst)
+    record = trace.record
 
     for i in range(1, len(lst)):
+        record(PASS, i)
         curr = lst[i]
+        record(LIFT, i)
         j = i
-        lst[i] = '_'
-        print(f"\tSorted lst: {lst[:i + 1]} -> adding {curr}")
         while j >= 1 and lst[j - 1] > curr:
             lst[j] = lst[j - 1]
-            lst[j - 1] = '_'
+            record(MOVE, j, j - 1)
             j -= 1
-            print(f"\t\t{lst[:i + 1]}")
 
         lst[j] = curr
-        print(f"\tDone adding {curr}: {lst[:i + 1]}\n")
+        record(DROP, j)
+
+    return trace
+
+
+def insertion_sort_itr_visualizer(lst: List[int]) -> None:
+    print(f"Visualizer\n\tUnsorted: {lst}\n")
+
+    # sort first, then render the recorded trace
+    for line in render(insertion_sort_traced(lst)):
+        print(line)
 
     print(f"\tSorted: {lst}\nVisualizer Done\n\n")
 
@@ -127,16 +239,23 @@ if __name__ == "__main__":
     insertion_sort_itr_visualizer(DEFAULT_UNSORTED_LIST[:])
 
     # analytics
-    versions = [insertion_sort_rcr, insertion_sort_itr1, insertion_sort_itr2]
+    versions = [insertion_sort_rcr, insertion_sort_itr1, insertion_sort_itr2,
+                binary_insertion_sort, shell_sort, shell_sort_sedgewick]
 
     test_versions(versions) # all valid
     time_versions(versions)
-    # short:
-    #    insertion_sort_rcr: 14.305 μs
-    #    insertion_sort_itr1: 4.675 μs
-    #    insertion_sort_itr2: 6.099 μs
+    # short (per call):
+    #    insertion_sort_rcr: 6.337 µs
+    #    insertion_sort_itr1: 2.886 µs
+    #    insertion_sort_itr2: 3.574 µs
+    #    binary_insertion_sort: 2.894 µs
+    #    shell_sort: 3.901 µs
+    #    shell_sort_sedgewick: 3.263 µs
     #
-    # long:
-    #    insertion_sort_rcr: 368.911 s (SLOW AS FUCK)
-    #    insertion_sort_itr1: 18.539 s
-    #    insertion_sort_itr2: 27.327 s
+    # long (per call):
+    #    insertion_sort_rcr: 12.332 ms (was 368.911 ms, and no recursion limit)
+    #    insertion_sort_itr1: 12.282 ms
+    #    insertion_sort_itr2: 19.376 ms
+    #    binary_insertion_sort: 1.033 ms
+    #    shell_sort: 736.230 µs
+    #    shell_sort_sedgewick: 823.830 µs
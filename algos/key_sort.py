@@ -0,0 +1,215 @@
+"""
+Written by Nat Getahun
+
+Key Sort
+--------
+Sorting records by a key with any of the sorts in here, without wrapping every
+record in an object with __lt__ (which turns every comparison into a python
+method call) and without moving the records around while sorting.
+
+Decorate-sort-undecorate: key(item) is computed exactly once per item and
+paired with the item's index, the sort runs over those decorated keys, and the
+indices read back off the result are the permutation that sorts the list
+(argsort). sort_by_key then just rearranges the list with it, one move per
+item.
+
+How keys get decorated:
+    - versions that count rather than compare (COUNTING_VERSIONS) rebuild
+    values instead of moving them, so they can't carry an index along. For
+    them, int keys skip the version entirely: the permutation comes straight
+    from a stable counting pass over the keys (or LSD passes of RADIX_BITS
+    bits each, when the range is too wide for one), like radix sort does
+    - for every other version, int keys are packed into one int each, (key -
+    lo) * n + index, as long as that fits in a signed 64-bit int, so versions
+    that work on int64s (parallel/external merge sort) can sort it too.
+    reverse packs (hi - key) instead. Wider ones fall back to tuples
+    - anything else becomes a (key, index) tuple, compared in C. reverse uses
+    (key, -index) and reads the result backwards. Versions that only take
+    ints can't sort these
+
+Every way, ties go to the earlier item, so the result is stable whether or not
+the version underneath is (see sort_analytics.STABLE), and reverse=True keeps
+equal items in their original order just like sorted(reverse=True).
+
+keyed(version) wraps a version into one that takes key= and reverse=.
+
+Complexity:
+    Time: O(n) on top of the version's own (O(n) key calls)
+    Space: O(n)
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Optional
+from benchmark import version_name
+from merge_sort import merge_sort_itr
+
+DEFAULT_VERSION = merge_sort_itr
+Key = Optional[Callable[[Any], Any]]
+
+INT64_MAX = (1 << 63) - 1
+RADIX_BITS = 8
+COUNTING_VERSIONS = {
+    'counting_sort', 'counting_sort_in_place', 'counting_sort_np',
+    'counting_sort_in_place_np', 'parallel_counting_sort', 'counting_sort_buf',
+    'radix_sort', 'radix_sort_16',
+}
+
+
+def argsort(lst: List[Any], key: Key=None, reverse: bool=False,
+            version: Callable=DEFAULT_VERSION) -> List[int]:
+    """Get the stable permutation of indices that sorts lst by key"""
+    n = len(lst)
+    if n < 2:
+        return list(range(n))
+
+    keys = list(map(key, lst)) if key is not None else list(lst)
+    if set(map(type, keys)) == {int}:
+        lo = min(keys)
+        hi = max(keys)
+        offsets = ([hi - k for k in keys] if reverse
+                   else [k - lo for k in keys])
+        if version_name(version) in COUNTING_VERSIONS:
+            return _counting_argsort(offsets, hi - lo + 1)
+
+        if (hi - lo + 1) * n - 1 <= INT64_MAX: # pack key and index into one int
+            dec = _sort(version, [k * n + i for i, k in enumerate(offsets)])
+            return [d % n for d in dec]
+
+        # too wide to pack, and offsets tie-break like keys do
+        dec = _sort(version, [(k, i) for i, k in enumerate(offsets)])
+        return [d[1] for d in dec]
+
+    if reverse:
+        dec = _sort(version, [(k, -i) for i, k in enumerate(keys)])
+        return [-d[1] for d in reversed(dec)]
+
+    dec = _sort(version, [(k, i) for i, k in enumerate(keys)])
+    return [d[1] for d in dec]
+
+
+def sort_by_key(lst: List[Any], key: Key=None, reverse: bool=False,
+                version: Callable=DEFAULT_VERSION) -> None:
+    """Stable sort of lst in place by key, moving each item once"""
+    perm = argsort(lst, key, reverse, version)
+    lst[:] = [lst[i] for i in perm]
+
+
+def keyed(version: Callable) -> Callable:
+    """Wrap version into a sort that also takes key= and reverse="""
+    def sort(lst: List[Any], prnt: bool=True, key: Key=None,
+             reverse: bool=False) -> None:
+        if prnt:
+            print(f"{version_name(sort)}\n\tUnsorted: {lst}")
+
+        sort_by_key(lst, key, reverse, version)
+
+        if prnt:
+            print(f"\tSorted: {lst}")
+
+    sort.__name__ = sort.__qualname__ = f"{version_name(version)}_keyed"
+    return sort
+
+
+def _counting_argsort(offsets: List[int], span: int) -> List[int]:
+    """Get the stable permutation sorting offsets (all in [0, span))"""
+    perm = list(range(len(offsets)))
+    if span <= max(len(offsets), 1 << RADIX_BITS): # narrow, 1 pass does it
+        return _counting_pass(perm, offsets, span)
+
+    mask = (1 << RADIX_BITS) - 1
+    shift = 0
+    while (span - 1) >> shift: # LSD, so every pass keeps the last one's order
+        digits = [(k >> shift) & mask for k in offsets]
+        perm = _counting_pass(perm, digits, mask + 1)
+        shift += RADIX_BITS
+
+    return perm
+
+
+def _counting_pass(perm: List[int], digits: List[int], size: int) -> List[int]:
+    """Stably reorder perm by digits[i] for each index i in it"""
+    counts = [0] * size
+    for d in digits:
+        counts[d] += 1
+
+    starts = [0] * size
+    total = 0
+    for d, ct in enumerate(counts):
+        starts[d] = total
+        total += ct
+
+    out = [0] * len(perm)
+    for i in perm:
+        d = digits[i]
+        out[starts[d]] = i
+        starts[d] += 1
+
+    return out
+
+
+def _sort(version: Callable, dec: List[Any]) -> List[Any]:
+    """Run version on dec, whether it sorts in place or returns a new list"""
+    out = version(dec, False)
+    return dec if out is None else out
+
+
+# main
+if __name__ == "__main__":
+    from functools import total_ordering
+    from random import Random
+    from time import perf_counter
+    from benchmark import ALL_VERSIONS, load_versions
+    from radix_sort import radix_sort
+    from sort_analytics import test_stability, test_versions, time_versions
+
+    # stability of every registered version on its own (not through argsort)
+    test_stability(load_versions(ALL_VERSIONS))
+
+    # analytics (int lists, so this is just the packing overhead)
+    versions = [merge_sort_itr, keyed(merge_sort_itr), keyed(radix_sort)]
+
+    test_versions(versions) # all valid
+    time_versions(versions)
+
+    # records: 10^5 dicts sorted by one field, 3 ways
+    @total_ordering
+    class ByScore:
+        __slots__ = ('rec',)
+
+        def __init__(self, rec):
+            self.rec = rec
+
+        def __eq__(self, other):
+            return self.rec['score'] == other.rec['score']
+
+        def __lt__(self, other):
+            return self.rec['score'] < other.rec['score']
+
+    rng = Random(0)
+    recs = [{'id': i, 'score': rng.randrange(10**6), 'name': f"user{i}"}
+            for i in range(10**5)]
+    by_score = lambda rec: rec['score']
+    expected = sorted(recs, key=by_score)
+
+    start = perf_counter()
+    wrapped = [ByScore(rec) for rec in recs]
+    merge_sort_itr(wrapped, False)
+    assert [w.rec for w in wrapped] == expected
+    print(f"\twrapped in __lt__ objects: {perf_counter() - start:.3f} s")
+
+    for version in (merge_sort_itr, radix_sort):
+        lst = recs[:]
+        start = perf_counter()
+        sort_by_key(lst, by_score, version=version)
+        assert lst == expected
+        print(f"\tsort_by_key ({version_name(version)}): "
+              f"{perf_counter() - start:.3f} s")
+
+    lst = recs[:]
+    start = perf_counter()
+    sort_by_key(lst, lambda rec: rec['name'], reverse=True)
+    assert lst == sorted(recs, key=lambda rec: rec['name'], reverse=True)
+    print(f"\tsort_by_key (str keys, reverse): {perf_counter() - start:.3f} s")
+    # wrapped in __lt__ objects: 0.608 s
+    # sort_by_key (merge_sort_itr): 0.226 s
+    # sort_by_key (radix_sort): 0.099 s (LSD counting passes over the keys)
+    # sort_by_key (str keys, reverse): 0.198 s
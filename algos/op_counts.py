@@ -0,0 +1,265 @@
+"""
+Written by Nat Getahun
+
+Op Counts
+---------
+Counted twins of the basic sorts, for seeing how much work each one actually
+does: element comparisons, swaps, single-element moves (writes), and auxiliary
+allocations (# of list slots allocated beyond the input, including temporary
+slices). The regular sorts stay exactly as they are, with no counters and no
+"am I counting?" checks in their loops; the counted versions are separate
+functions that mirror them step for step, and are only run when asked for.
+
+Every counted version sorts lst in place (even when the version it mirrors
+returns a new list) and returns an OpCounts. COUNTED maps version names to
+their counted twins, and count_ops looks one up and runs it on a copy.
+
+The recursive merge sort's merge is mirrored with cursors instead of
+recursion, but it tallies the slices and concatenations the recursive one
+would make, which is where its quadratic allocation shows up.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class OpCounts(NamedTuple):
+    comparisons: int
+    swaps: int
+    moves: int
+    allocs: int
+
+    def __str__(self) -> str:
+        return (f"comparisons={self.comparisons}, swaps={self.swaps}, "
+                f"moves={self.moves}, allocs={self.allocs}")
+
+
+def counted_bubble_sort(lst: List[int]) -> OpCounts:
+    """Mirror of bubble_sort.bubble_sort"""
+    cmps = swaps = 0
+    for i in range(len(lst))[::-1]:
+        swapped = False
+        for j in range(i):
+            cmps += 1
+            if lst[j] > lst[j + 1]:
+                lst[j], lst[j + 1] = lst[j + 1], lst[j]
+                swaps += 1
+                swapped = True
+
+        if not swapped:
+            break
+
+    return OpCounts(cmps, swaps, 0, 0)
+
+
+def counted_selection_sort(lst: List[int]) -> OpCounts:
+    """Mirror of selection_sort.selection_sort"""
+    cmps = swaps = 0
+    for i in range(len(lst)):
+        min_idx = i
+        for j in range(i + 1, len(lst)):
+            cmps += 1
+            if lst[j] < lst[min_idx]:
+                min_idx = j
+
+        if min_idx != i:
+            lst[i], lst[min_idx] = lst[min_idx], lst[i]
+            swaps += 1
+
+    return OpCounts(cmps, swaps, 0, 0)
+
+
+def counted_insertion_sort_itr1(lst: List[int]) -> OpCounts:
+    """Mirror of insertion_sort.insertion_sort_itr1"""
+    cmps = moves = 0
+    for i in range(1, len(lst)):
+        curr = lst[i]
+        j = i
+        while j >= 1:
+            cmps += 1
+            if not lst[j - 1] > curr:
+                break
+            lst[j] = lst[j - 1]
+            moves += 1
+            j -= 1
+
+        lst[j] = curr
+        moves += 1
+
+    return OpCounts(cmps, 0, moves, 0)
+
+
+def counted_insertion_sort_itr2(lst: List[int]) -> OpCounts:
+    """Mirror of insertion_sort.insertion_sort_itr2"""
+    cmps = swaps = 0
+    for i in range(1, len(lst)):
+        j = i
+        while j >= 1:
+            cmps += 1
+            if not lst[j - 1] > lst[j]:
+                break
+            lst[j], lst[j - 1] = lst[j - 1], lst[j]
+            swaps += 1
+            j -= 1
+
+    return OpCounts(cmps, swaps, 0, 0)
+
+
+def counted_merge_sort(lst: List[int]) -> OpCounts:
+    """Mirror of merge_sort.merge_sort (recursive halving, slicing merge)"""
+    totals = [0, 0, 0] # comparisons, moves, allocs
+    lst[:] = _counted_merge_sort(lst, totals)
+    return OpCounts(totals[0], 0, totals[1], totals[2])
+
+
+def _counted_merge_sort(lst: List[int], totals: List[int]) -> List[int]:
+    if len(lst) < 2:
+        return lst
+
+    mid_idx = len(lst) // 2
+    totals[2] += len(lst) # the two halves
+    left = _counted_merge_sort(lst[:mid_idx], totals)
+    right = _counted_merge_sort(lst[mid_idx:], totals)
+    return _counted_merge(left, right, totals)
+
+
+def _counted_merge(lst1: List[int], lst2: List[int], totals: List[int]) -> List[int]:
+    """Merge with cursors, tallying what merge_sort.merge's recursion allocates"""
+    out = []
+    cmps = allocs = 0
+    i = j = 0
+    while i < len(lst1) and j < len(lst2):
+        x = len(lst1) - i
+        y = len(lst2) - j
+        allocs += x + y # lst[:1] + merge(...) builds a list of everything left
+        cmps += 1
+        if lst1[i] < lst2[j]:
+            out.append(lst1[i])
+            allocs += 1 + (x - 1) # lst1[:1] and lst1[1:]
+            i += 1
+            continue
+
+        cmps += 1
+        if lst1[i] > lst2[j]:
+            out.append(lst2[j])
+            allocs += 1 + (y - 1)
+            j += 1
+        else:
+            out.append(lst1[i])
+            out.append(lst2[j])
+            allocs += 2 + (x - 1) + (y - 1) + 2 # both heads, tails, heads' concat
+            i += 1
+            j += 1
+
+    out.extend(lst1[i:] if i < len(lst1) else lst2[j:])
+    totals[0] += cmps
+    totals[1] += len(out)
+    totals[2] += allocs
+    return out
+
+
+def counted_merge_sort_itr(lst: List[int]) -> OpCounts:
+    """Mirror of merge_sort.merge_sort_itr"""
+    n = len(lst)
+    if n < 2:
+        return OpCounts(0, 0, 0, 0)
+
+    cmps = moves = 0
+    src = lst
+    dst = lst[:]
+    allocs = n
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                cmps += 1
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+
+            # tail copies go through a temporary slice
+            tail = src[i:mid] if i < mid else src[j:hi]
+            dst[k:hi] = tail
+            allocs += len(tail)
+            moves += hi - lo
+
+        src, dst = dst, src
+        width *= 2
+
+    if src is not lst:
+        lst[:] = src
+        moves += n
+
+    return OpCounts(cmps, 0, moves, allocs)
+
+
+def counted_counting_sort(lst: List[int], in_place: bool=False) -> OpCounts:
+    """Mirror of counting_sort.counting_sort (or counting_sort_in_place)"""
+    if not lst:
+        return OpCounts(0, 0, 0, 0)
+
+    cmps = 0
+    lo = hi = lst[0]
+    for n in lst:
+        cmps += 1
+        if n > hi:
+            hi = n
+        else:
+            cmps += 1
+            if n < lo:
+                lo = n
+
+    counts = [0] * (hi - lo + 1)
+    for n in lst:
+        counts[n - lo] += 1
+
+    idx = 0
+    for i, ct in enumerate(counts):
+        for j in range(idx, ct + idx):
+            lst[j] = i + lo
+        idx += ct
+
+    allocs = len(counts) + (0 if in_place else len(lst)) # new list if not in place
+    return OpCounts(cmps, 0, len(lst), allocs)
+
+
+def counted_counting_sort_in_place(lst: List[int]) -> OpCounts:
+    """Mirror of counting_sort.counting_sort_in_place"""
+    return counted_counting_sort(lst, in_place=True)
+
+
+COUNTED: Dict[str, Callable[[List[int]], OpCounts]] = {
+    'bubble_sort': counted_bubble_sort,
+    'selection_sort': counted_selection_sort,
+    'insertion_sort_itr1': counted_insertion_sort_itr1,
+    'insertion_sort_itr2': counted_insertion_sort_itr2,
+    'merge_sort': counted_merge_sort,
+    'merge_sort_itr': counted_merge_sort_itr,
+    'counting_sort': counted_counting_sort,
+    'counting_sort_in_place': counted_counting_sort_in_place,
+}
+
+
+def count_ops(version: Callable, lst: List[int]) -> Optional[OpCounts]:
+    """Run version's counted twin on a copy of lst (None if it has no twin)"""
+    counted = COUNTED.get(getattr(version, '__name__', None))
+    if counted is None:
+        return None
+    return counted(list(lst))
+
+
+# main
+if __name__ == "__main__":
+    from sort_analytics import DEFAULT_UNSORTED_LIST_LONG
+
+    for name, counted in COUNTED.items():
+        lst = DEFAULT_UNSORTED_LIST_LONG[:]
+        counts = counted(lst)
+        assert lst == sorted(DEFAULT_UNSORTED_LIST_LONG)
+        print(f"{name}: {counts}")
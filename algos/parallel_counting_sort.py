@@ -0,0 +1,309 @@
+"""
+Written by Nat Getahun
+
+Parallel Counting Sort
+----------------------
+Counting sort spread across a pool of worker processes, for big lists of ints
+with a small range (status codes, bucketed latencies, ...). Like the parallel
+merge sort, the keys are copied once into a shared memory block of int64s so
+that workers attach to it by name instead of having it pickled over to them.
+
+Every pass splits the list into one contiguous chunk per worker:
+    1. each worker finds its chunk's min and max, which get reduced to the
+    global range [lo, hi] (k = hi - lo + 1 counters)
+    2. each worker counts its chunk into its own row of a shared (workers x k)
+    histogram, so nobody writes to anybody else's counters
+    3. the rows are summed, and a prefix sum over the totals gives where each
+    value's run starts in the output
+    4. the output gets written in parallel:
+        - bare ints don't need to know where they came from, so the value range
+        is split into pieces with about the same # of items each, and every
+        worker rewrites its values' runs with one slice assignment apiece
+        - key/value pairs need to stay stable, so each histogram row is turned
+        into that chunk's own starting offsets (value's start + counts of that
+        value in earlier chunks). Every worker then walks its chunk in order and
+        scatters each item's original index to its offset. The parent uses that
+        permutation to rearrange the pairs, so payloads can be any python object
+        and never go through shared memory.
+
+Keys must fit in a signed 64-bit int, and like counting sort it's only a good
+idea when k isn't much bigger than n. Ranges too wide for the counters to fit
+in memory raise ValueError, on the pool path and the sequential one alike.
+
+Complexity:
+    Time: O(n / p + kp) (p = # of workers)
+    Space: O(n + kp)
+"""
+from __future__ import annotations
+from typing import Any, List, Optional, Sequence, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing.shared_memory import SharedMemory
+import os
+import sys
+from counting_sort import counting_sort
+from sort_analytics import test_versions, time_versions
+
+DEFAULT_CUTOFF = 1 << 16 # below this, process startup costs more than it saves
+
+Pair = Tuple[int, Any]
+
+
+def parallel_counting_sort(lst: List[int], prnt: bool=True,
+                           workers: Optional[int]=None,
+                           cutoff: int=DEFAULT_CUTOFF) -> None:
+    """Wrapper for _parallel_counting_sort for printing purposes"""
+    if prnt:
+        print(f"Parallel Counting Sort\n\tUnsorted: {lst}")
+
+    _parallel_counting_sort(lst, workers or os.cpu_count() or 1, cutoff)
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def parallel_counting_sort_pairs(pairs: List[Pair], prnt: bool=True,
+                                 workers: Optional[int]=None,
+                                 cutoff: int=DEFAULT_CUTOFF) -> None:
+    """Wrapper for _parallel_counting_sort_pairs for printing purposes"""
+    if prnt:
+        print(f"Parallel Counting Sort Pairs\n\tUnsorted: {pairs}")
+
+    _parallel_counting_sort_pairs(pairs, workers or os.cpu_count() or 1, cutoff)
+
+    if prnt:
+        print(f"\tSorted: {pairs}")
+
+
+def _parallel_counting_sort(lst: List[int], workers: int, cutoff: int) -> None:
+    """Sort ints in place from per-chunk histograms, rewriting runs in parallel"""
+    n = len(lst)
+    if n < 2:
+        return
+    if n < cutoff or workers < 2:
+        lst[:] = counting_sort(lst, False)
+        return
+
+    shm = SharedMemory(create=True, size=n * 8)
+    try:
+        with shm.buf.cast('q') as buf:
+            buf[:] = array('q', lst)
+
+        with ProcessPoolExecutor(workers) as pool:
+            lo, rows = _histograms(pool, shm.name, _chunks(n, workers))
+            totals = [sum(col) for col in zip(*rows)]
+
+            # split the value range into pieces of ~n / workers items each
+            starts = [0, *accumulate(totals)]
+            share = -(-n // workers)
+            tasks = []
+            v0 = 0
+            for v in range(1, len(totals) + 1):
+                if v == len(totals) or starts[v] - starts[v0] >= share:
+                    tasks.append((starts[v0], lo + v0, totals[v0:v]))
+                    v0 = v
+
+            list(pool.map(_write_runs, [shm.name] * len(tasks), tasks))
+
+        with shm.buf.cast('q') as buf:
+            lst[:] = buf.tolist()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _parallel_counting_sort_pairs(pairs: List[Pair], workers: int,
+                                  cutoff: int) -> None:
+    """Stable sort of (key, value) pairs in place by their int keys"""
+    n = len(pairs)
+    if n < 2:
+        return
+    if n < cutoff or workers < 2:
+        _counting_sort_pairs(pairs)
+        return
+
+    keys = SharedMemory(create=True, size=n * 8)
+    perm = SharedMemory(create=True, size=n * 8)
+    offsets = None
+    try:
+        with keys.buf.cast('q') as buf:
+            buf[:] = array('q', [key for key, _ in pairs])
+
+        runs = _chunks(n, workers)
+        with ProcessPoolExecutor(workers) as pool:
+            lo, rows = _histograms(pool, keys.name, runs)
+
+            # chunk c's items of value v start after every smaller value and
+            # after chunks before c's items of value v
+            k = len(rows[0])
+            offsets = SharedMemory(create=True, size=len(runs) * k * 8)
+            with offsets.buf.cast('q') as offs:
+                start = 0
+                for v in range(k):
+                    for c, row in enumerate(rows):
+                        offs[c * k + v] = start
+                        start += row[v]
+
+            tasks = [(c, lo, lo_hi) for c, lo_hi in enumerate(runs)]
+            names = [(keys.name, offsets.name, perm.name)] * len(tasks)
+            list(pool.map(_scatter_chunk, names, tasks, [k] * len(tasks)))
+
+        with perm.buf.cast('q') as buf:
+            pairs[:] = [pairs[i] for i in buf.tolist()]
+    finally:
+        for shm in (keys, perm, offsets):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def _chunks(n: int, workers: int) -> List[Tuple[int, int]]:
+    """Split range(n) into 1 contiguous (lo, hi) chunk per worker"""
+    size = -(-n // workers)
+    return [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+
+
+def _histograms(pool: ProcessPoolExecutor, name: str,
+                runs: List[Tuple[int, int]]) -> Tuple[int, List[List[int]]]:
+    """Get lo and one histogram row per chunk of the shared keys"""
+    names = [name] * len(runs)
+    ranges = list(pool.map(_chunk_range, names, runs))
+    lo = min(r[0] for r in ranges)
+    hi = max(r[1] for r in ranges)
+    k = hi - lo + 1
+    if k >= sys.maxsize // (8 * len(runs)): # histogram can't even be addressed
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count")
+
+    try:
+        hist = SharedMemory(create=True, size=len(runs) * k * 8)
+    except OSError: # could exist, just not on this machine
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count") from None
+    try:
+        tasks = [(c, lo, k) for c in range(len(runs))]
+        list(pool.map(_chunk_histogram, [(name, hist.name)] * len(runs),
+                      runs, tasks))
+        with hist.buf.cast('q') as buf:
+            rows = [buf[c * k:(c + 1) * k].tolist() for c in range(len(runs))]
+    except MemoryError: # a worker's counters didn't fit
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count") from None
+    finally:
+        hist.close()
+        hist.unlink()
+
+    return lo, rows
+
+
+def _counting_sort_pairs(pairs: List[Pair]) -> None:
+    """Stable sequential counting sort of (key, value) pairs, in place"""
+    lo = min(key for key, _ in pairs)
+    hi = max(key for key, _ in pairs)
+    if hi - lo >= sys.maxsize: # not even a list of counters that long can exist
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count")
+    try:
+        counts = [0] * (hi - lo + 1)
+    except MemoryError: # could exist, just not on this machine
+        raise ValueError(f"range [{lo}, {hi}] is too wide to count") from None
+    for key, _ in pairs:
+        counts[key - lo] += 1
+
+    offs = [0, *accumulate(counts)]
+    out = [None] * len(pairs)
+    for pair in pairs:
+        v = pair[0] - lo
+        out[offs[v]] = pair
+        offs[v] += 1
+
+    pairs[:] = out
+
+
+# worker functions (module level so they can be sent to the pool)
+def _chunk_range(name: str, bounds: Tuple[int, int]) -> Tuple[int, int]:
+    """Get the min and max of one chunk of a shared block"""
+    lo, hi = bounds
+    shm = SharedMemory(name=name)
+    try:
+        with shm.buf.cast('q') as buf, buf[lo:hi] as chunk:
+            return min(chunk), max(chunk)
+    finally:
+        shm.close()
+
+
+def _chunk_histogram(names: Tuple[str, str], bounds: Tuple[int, int],
+                     task: Tuple[int, int, int]) -> None:
+    """Count one chunk's keys into its own row c of the shared histogram"""
+    c, lo, k = task
+    keys_shm = SharedMemory(name=names[0])
+    hist_shm = SharedMemory(name=names[1])
+    try:
+        with keys_shm.buf.cast('q') as keys, hist_shm.buf.cast('q') as hist:
+            counts = [0] * k
+            for key in keys[bounds[0]:bounds[1]].tolist():
+                counts[key - lo] += 1
+            hist[c * k:(c + 1) * k] = array('q', counts)
+    finally:
+        keys_shm.close()
+        hist_shm.close()
+
+
+def _write_runs(name: str, task: Tuple[int, int, Sequence[int]]) -> None:
+    """Write value's run for every count, starting at idx"""
+    idx, value, counts = task
+    shm = SharedMemory(name=name)
+    try:
+        with shm.buf.cast('q') as buf:
+            for ct in counts:
+                if ct > 0:
+                    buf[idx:idx + ct] = array('q', [value]) * ct
+                    idx += ct
+                value += 1
+    finally:
+        shm.close()
+
+
+def _scatter_chunk(names: Tuple[str, str, str],
+                   task: Tuple[int, int, Tuple[int, int]], k: int) -> None:
+    """Write each of chunk c's original indices to its key's next offset"""
+    c, lo, (start, end) = task
+    keys_shm, offs_shm, perm_shm = (SharedMemory(name=name) for name in names)
+    try:
+        with keys_shm.buf.cast('q') as keys, offs_shm.buf.cast('q') as offsets, \
+                perm_shm.buf.cast('q') as perm:
+            offs = offsets[c * k:(c + 1) * k].tolist()
+            for i, key in enumerate(keys[start:end].tolist(), start):
+                v = key - lo
+                perm[offs[v]] = i
+                offs[v] += 1
+    finally:
+        for shm in (keys_shm, offs_shm, perm_shm):
+            shm.close()
+
+
+# main
+if __name__ == "__main__":
+    from random import randrange
+    from time import perf_counter
+
+    # analytics
+    versions = [parallel_counting_sort]
+
+    test_versions(versions) # valid (below the cutoff, so sequential)
+    time_versions(versions)
+
+    # scaling: one run per worker count over 10^7 status codes
+    codes = (200, 201, 204, 301, 302, 304, 400, 401, 403, 404, 500, 502, 503)
+    big = [codes[randrange(len(codes))] for _ in range(10**7)]
+    for workers in (1, 2, 4, 8):
+        lst = big[:]
+        start = perf_counter()
+        parallel_counting_sort(lst, False, workers=workers)
+        print(f"\t{workers} workers: {perf_counter() - start:.3f} s")
+
+    # stable pairs: (status, request #), ties must stay in request order
+    pairs = list(zip(big[:10**6], range(10**6)))
+    for workers in (1, 4):
+        lst = pairs[:]
+        start = perf_counter()
+        parallel_counting_sort_pairs(lst, False, workers=workers)
+        print(f"\tpairs, {workers} workers: {perf_counter() - start:.3f} s")
+        assert lst == sorted(pairs)
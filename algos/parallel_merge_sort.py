@@ -0,0 +1,180 @@
+"""
+Written by Nat Getahun
+
+Parallel Merge Sort
+-------------------
+Same idea as merge sort, just spread across a pool of worker processes. The list
+is copied once into a shared memory block of int64s so that workers can attach
+to it by name instead of having the whole list pickled over to them. Each worker
+sorts one contiguous chunk, then the sorted chunks are merged pairwise, level by
+level, ping-ponging between two shared blocks until a single run is left.
+
+Merging pairwise alone would leave most workers idle near the top of the tree
+(the last level is one big merge), so every pairwise merge is also cut into
+independent slices. For an output position k, a binary search over the left run
+finds how many of the first k merged elements come from it (its "co-rank"), so
+each slice knows exactly which parts of both runs it owns and where its output
+starts.
+
+Cases:
+    List is shorter than the cutoff or only 1 worker: plain iterative merge sort
+    Otherwise: - copy list into shared memory
+               - sort one chunk per worker
+               - merge neighbouring chunks in parallel slices until 1 is left
+               - copy the result back into the list
+
+Values must fit in a signed 64-bit int.
+
+Complexity:
+    Time: O(nlogn / p + n) (p = # of workers, the extra n is the copies)
+    Space: O(n)
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import os
+from merge_sort import _merge_sort_itr, merge_into
+from sort_analytics import test_versions, time_versions
+
+DEFAULT_CUTOFF = 1 << 15 # below this, process startup costs more than it saves
+
+
+def parallel_merge_sort(lst: List[int], prnt: bool=True,
+                        workers: Optional[int]=None,
+                        cutoff: int=DEFAULT_CUTOFF) -> None:
+    """Wrapper for _parallel_merge_sort for printing purposes"""
+    if prnt:
+        print(f"Parallel Merge Sort\n\tUnsorted: {lst}")
+
+    _parallel_merge_sort(lst, workers or os.cpu_count() or 1, cutoff)
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def _parallel_merge_sort(lst: List[int], workers: int, cutoff: int) -> None:
+    """Sort in place by sorting chunks in parallel, then merging them"""
+    n = len(lst)
+    if n < max(cutoff, 2) or workers < 2:
+        _merge_sort_itr(lst)
+        return
+
+    shms = [SharedMemory(create=True, size=n * 8) for _ in range(2)]
+    try:
+        with shms[0].buf.cast('q') as buf:
+            buf[:] = array('q', lst)
+
+        chunk = -(-n // workers)
+        runs = [(lo, min(lo + chunk, n)) for lo in range(0, n, chunk)]
+        src, dst = 0, 1
+        with ProcessPoolExecutor(workers) as pool:
+            # sort each chunk on its own worker
+            names = [shms[src].name] * len(runs)
+            list(pool.map(_sort_chunk, names, runs))
+
+            # merge neighbouring runs until only one is left
+            while len(runs) > 1:
+                pairs = len(runs) // 2
+                slices = max(1, workers // pairs)
+                tasks = []
+                merged = []
+                with shms[src].buf.cast('q') as buf:
+                    for k in range(0, len(runs), 2):
+                        lo, mid = runs[k]
+                        hi = runs[k + 1][1] if k + 1 < len(runs) else mid
+                        tasks.extend(_split_merge(buf, lo, mid, hi, slices))
+                        merged.append((lo, hi))
+
+                names = [(shms[src].name, shms[dst].name)] * len(tasks)
+                list(pool.map(_merge_slice, names, tasks))
+                runs = merged
+                src, dst = dst, src
+
+        with shms[src].buf.cast('q') as buf:
+            lst[:] = buf.tolist()
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
+def _split_merge(buf: memoryview, lo: int, mid: int, hi: int,
+                 slices: int) -> List[Tuple[int, int, int, int, int]]:
+    """Cut the merge of buf[lo:mid] and buf[mid:hi] into independent slices"""
+    step = -(-(hi - lo) // slices)
+    bounds = [(lo, mid)] # (left cursor, right cursor) at each cut
+    for k in range(step, hi - lo, step):
+        i = co_rank(buf, lo, mid, hi, k)
+        bounds.append((lo + i, mid + k - i))
+    bounds.append((mid, hi))
+
+    return [(i0, i1, j0, j1, i0 + j0 - mid)
+            for (i0, j0), (i1, j1) in zip(bounds, bounds[1:])]
+
+
+def co_rank(buf: memoryview, lo: int, mid: int, hi: int, k: int) -> int:
+    """Get # of elements from buf[lo:mid] among the first k of the merged runs"""
+    left = max(0, k - (hi - mid))
+    right = min(k, mid - lo)
+    while left < right:
+        i = (left + right) // 2
+        # left run wins ties, so buf[lo + i] goes first if it's <= its rival
+        if buf[lo + i] <= buf[mid + k - i - 1]:
+            left = i + 1
+        else:
+            right = i
+
+    return left
+
+
+# worker functions (module level so they can be sent to the pool)
+def _sort_chunk(name: str, bounds: Tuple[int, int]) -> None:
+    """Sort one chunk of a shared block in place"""
+    lo, hi = bounds
+    shm = SharedMemory(name=name)
+    try:
+        with shm.buf.cast('q') as buf:
+            chunk = buf[lo:hi].tolist()
+            _merge_sort_itr(chunk)
+            buf[lo:hi] = array('q', chunk)
+    finally:
+        shm.close()
+
+
+def _merge_slice(names: Tuple[str, str],
+                 task: Tuple[int, int, int, int, int]) -> None:
+    """Merge src[i0:i1] and src[j0:j1] into dst starting at index k"""
+    i0, i1, j0, j1, k = task
+    src_shm = SharedMemory(name=names[0])
+    dst_shm = SharedMemory(name=names[1])
+    try:
+        with src_shm.buf.cast('q') as src, dst_shm.buf.cast('q') as dst:
+            run = src[i0:i1].tolist() + src[j0:j1].tolist()
+            out = run[:]
+            merge_into(run, out, 0, i1 - i0, len(run))
+            dst[k:k + len(out)] = array('q', out)
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+# main
+if __name__ == "__main__":
+    from random import randrange
+    from time import perf_counter
+
+    # analytics
+    versions = [parallel_merge_sort]
+
+    test_versions(versions) # valid (below the cutoff, so sequential)
+    time_versions(versions)
+
+    # scaling: one run per worker count over 10^7 random ints
+    big = [randrange(-2**62, 2**62) for _ in range(10**7)]
+    for workers in (1, 2, 4, 8, 16, 32):
+        lst = big[:]
+        start = perf_counter()
+        parallel_merge_sort(lst, False, workers=workers)
+        print(f"\t{workers} workers: {perf_counter() - start:.3f} s")
@@ -0,0 +1,119 @@
+"""
+Written by Nat Getahun
+
+Radix Sort
+----------
+Counting sort falls over as soon as the range of the list gets big, since it
+needs one counter per possible value - a single 2**40 in the list means 2**40
+counters. Radix sort gets around that by never counting whole values. Instead it
+splits every value into fixed-size digits (8 or 16 bits) and runs one stable
+counting pass per digit, least significant digit first. Each pass only needs
+2**bits counters, and since every pass is stable, ties on the current digit keep
+the order set by the previous (less significant) digits, so after the last pass
+the list is fully sorted.
+
+Negative numbers are handled by sorting offsets from the minimum (n - lo)
+instead of the values themselves, so every key is nonnegative. Keys live in
+array('Q') buffers rather than lists to keep them compact.
+
+Cases:
+    List has less than 2 elements: already sorted
+    Range is small (<= max(n, 2**bits)): plain counting sort is cheaper
+    Range is large: - shift every value by the minimum
+                    - one stable counting pass per digit, ping-ponging between
+                    two buffers
+                    - shift back and write into the list
+
+Values must fit in a signed 64-bit int.
+
+Complexity:
+    Time: O(d(n + r)) (d = # of digits, r = 2**bits)
+    Space: O(n + r)
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from array import array
+from counting_sort import _counting_sort
+from sort_analytics import test_versions, time_versions
+
+
+def radix_sort(lst: List[int], prnt: bool=True, bits: int=8) -> None:
+    """Wrapper for _radix_sort for printing purposes"""
+    if prnt:
+        print(f"Radix Sort\n\tUnsorted: {lst}")
+
+    _radix_sort(lst, bits)
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def radix_sort_16(lst: List[int], prnt: bool=True) -> None:
+    """Radix sort with 16-bit digits (fewer passes, bigger count table)"""
+    radix_sort(lst, prnt, bits=16)
+
+
+def _radix_sort(lst: List[int], bits: int,
+                bounds: Optional[Tuple[int, int]]=None) -> None:
+    """Sort in place with counting sort or LSD radix passes, whichever is cheaper"""
+    n = len(lst)
+    if n < 2:
+        return
+
+    lo, hi = bounds if bounds is not None else (min(lst), max(lst))
+    if hi - lo <= max(n, 1 << bits):
+        _counting_sort(lst, False, in_place=True, bounds=(lo, hi))
+        return
+
+    # offsets from the minimum are nonnegative, so digits never see a sign bit
+    src = array('Q', [x - lo for x in lst])
+    dst = array('Q', bytes(8 * n))
+    for shift in range(0, (hi - lo).bit_length(), bits):
+        counting_pass(src, dst, shift, (1 << bits) - 1)
+        src, dst = dst, src
+
+    lst[:] = [k + lo for k in src]
+
+
+def counting_pass(src: array, dst: array, shift: int, mask: int) -> None:
+    """Stable counting sort of src into dst on the digit (key >> shift) & mask"""
+    # count occurrences of each digit
+    counts = [0] * (mask + 1)
+    for k in src:
+        counts[(k >> shift) & mask] += 1
+
+    # turn counts into the index where each digit's run starts
+    total = 0
+    for d, ct in enumerate(counts):
+        counts[d] = total
+        total += ct
+
+    # place keys in order of appearance so the pass stays stable
+    for k in src:
+        d = (k >> shift) & mask
+        dst[counts[d]] = k
+        counts[d] += 1
+
+
+# main
+if __name__ == "__main__":
+    from random import randrange
+
+    # analytics
+    versions = [radix_sort, radix_sort_16]
+
+    test_versions(versions) # all valid (small range, so counting sort runs)
+    test_versions(versions, [randrange(-2**62, 2**62) for _ in range(1000)])
+    time_versions(versions)
+    # short:
+    #    radix_sort: 9.555 µs
+    #    radix_sort_16: 8.332 µs
+    #
+    # long:
+    #    radix_sort: 555.221 µs
+    #    radix_sort_16: 654.414 µs
+
+    time_versions(versions, [randrange(-2**40, 2**40) for _ in range(975)])
+    # wide (975 elements in +-2**40, where counting sort can't even allocate):
+    #    radix_sort: 1.527 ms
+    #    radix_sort_16: 10.825 ms (2**16 counters per pass swamp 975 elements)
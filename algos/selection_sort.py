@@ -8,13 +8,27 @@ index by swapping it with the first element. We then get the minimum element of
 the list sans the first element and swap it with the second element. Continue
 doing this until we reach the last index, at which point our list is sorted.
 
+The slow part is finding the minimum: a linear scan of everything left, every
+pass, throwing away everything the previous scans learned. Two variants keep
+the selecting but make it cheaper:
+    - heap_sort arranges the list into a max heap first (in place), so the
+    largest remaining element is always at index 0. Each pass swaps it to the
+    end of the unsorted section and sifts the new root down, O(logn) work.
+    - tournament_sort plays the elements off in a knockout bracket (a complete
+    binary tree of winners' indices). After the winner is taken, only the
+    matches along its path to the root get replayed, so every other result is
+    reused. Ties go to the left, which makes it stable.
+
 Complexity:
     Time: O(n^2)
     Space: O(1)
+    heap_sort: Time O(nlogn), Space O(1)
+    tournament_sort: Time O(nlogn), Space O(n)
 """
 from __future__ import annotations
 from typing import List
 from sort_analytics import test_versions, time_versions, DEFAULT_UNSORTED_LIST
+from sort_trace import SortTrace, PASS, SWAP, render
 
 
 def selection_sort(lst: List[int], prnt: bool=True) -> None:
@@ -37,10 +51,108 @@ def selection_sort(lst: List[int], prnt: bool=True) -> None:
         print(f"\tSorted: {lst}")
 
 
+def heap_sort(lst: List[int], prnt: bool=True) -> None:
+    """Sort by repeatedly moving the root of a max heap to the end of lst"""
+    if prnt:
+        print(f"Heap Sort\n\tUnsorted: {lst}")
+
+    n = len(lst)
+    for i in range(n // 2 - 1, -1, -1): # heapify, leaves are already heaps
+        _sift_down(lst, i, n)
+
+    for end in range(n - 1, 0, -1):
+        tmp = lst[end]
+        lst[end] = lst[0]
+        lst[0] = tmp
+        _sift_down(lst, 0, end)
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def _sift_down(lst: List[int], i: int, end: int) -> None:
+    """Move lst[i] down the max heap lst[:end] until neither child is bigger"""
+    item = lst[i]
+    child = 2 * i + 1
+    while child < end:
+        if child + 1 < end and lst[child + 1] > lst[child]:
+            child += 1
+        if lst[child] <= item:
+            break
+
+        lst[i] = lst[child] # pull the child up into the hole
+        i = child
+        child = 2 * i + 1
+
+    lst[i] = item
+
+
+def tournament_sort(lst: List[int], prnt: bool=True) -> None:
+    """Sort by taking each tournament's winner, then replaying only its path"""
+    if prnt:
+        print(f"Tournament Sort\n\tUnsorted: {lst}")
+
+    n = len(lst)
+    if n > 1:
+        # tree[1] is the final, leaves start at size, -1 marks an empty slot
+        size = 1 << (n - 1).bit_length()
+        tree = [-1] * size + list(range(n)) + [-1] * (size - n)
+        for node in range(size - 1, 0, -1):
+            tree[node] = _winner(lst, tree[2 * node], tree[2 * node + 1])
+
+        out = []
+        for _ in range(n):
+            win = tree[1]
+            out.append(lst[win])
+            node = size + win
+            tree[node] = -1
+            node //= 2
+            while node:
+                tree[node] = _winner(lst, tree[2 * node], tree[2 * node + 1])
+                node //= 2
+
+        lst[:] = out
+
+    if prnt:
+        print(f"\tSorted: {lst}")
+
+
+def _winner(lst: List[int], left: int, right: int) -> int:
+    """Get the index of the smaller of lst[left] and lst[right] (left on ties)"""
+    if left < 0:
+        return right
+    if right < 0 or lst[left] <= lst[right]:
+        return left
+    return right
+
+
+def selection_sort_traced(lst: List[int]) -> SortTrace:
+    """Sort like selection_sort, recording every pass and swap into a trace"""
+    trace = SortTrace(lst)
+    record = trace.record
+
+    for i in range(len(lst)):
+        record(PASS, i + 1)
+        min_idx = i
+        for j in range(i + 1, len(lst)):
+            if lst[j] < lst[min_idx]:
+                min_idx = j
+
+        if min_idx != i:
+            tmp = lst[i]
+            lst[i] = lst[min_idx]
+            lst[min_idx] = tmp
+            record(SWAP, i, min_idx)
+
+    return trace
+
+
 def selection_sort_visualizer(lst: List[int]) -> None:
     print(f"Visualizer\n\tUnsorted: {lst}\n")
 
-    pass
+    # sort first, then render the recorded trace
+    for line in render(selection_sort_traced(lst)):
+        print(line)
 
     print(f"\tSorted: {lst}\nVisualizer Done\n\n")
 
@@ -48,12 +160,19 @@ def selection_sort_visualizer(lst: List[int]) -> None:
 # main
 if __name__ == "__main__":
     # visualize the sorting process
-    #selection_sort_visualizer(DEFAULT_UNSORTED_LIST[:])
+    selection_sort_visualizer(DEFAULT_UNSORTED_LIST[:])
 
     # analytics
-    versions = [selection_sort]
+    versions = [selection_sort, heap_sort, tournament_sort]
 
-    test_versions(versions) # valid
+    test_versions(versions) # all valid
     time_versions(versions)
-    # short: 6.240 µs
-    # long: 13.256 s
\ No newline at end of file
+    # short (per call):
+    #    selection_sort: 6.242 µs
+    #    heap_sort: 7.022 µs
+    #    tournament_sort: 10.943 µs
+    #
+    # long (per call):
+    #    selection_sort: 11.608 ms
+    #    heap_sort: 984.153 µs
+    #    tournament_sort: 1.321 ms
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Written by Nat Getahun
+
+Sort Trace
+----------
+Recording and replaying what a sort does, so the visualizers don't have to
+format the whole list on every step. A traced sort logs compact (op, i, j)
+events into an array('q') as it goes (three ints per event, no strings), and
+all of the rendering happens afterwards, lazily, from a replay of those events
+on a copy of the starting list. Traces can also be saved to and loaded from
+binary files.
+
+Events:
+    PASS i: start of pass/iteration # i
+    SWAP i j: swap lst[i] and lst[j]
+    MOVE i j: lst[i] = lst[j], leaving a hole at j if i was the hole
+    LIFT i: pick up lst[i] (leaving a hole at i)
+    DROP i: put down whatever was picked up at lst[i]
+
+Replay can jump to any event with seek (it keeps a copy of the state every
+checkpoint_every events it passes, so seeking back doesn't start from 0) and
+can sample every step-th frame with frames.
+
+File format (all native int64s):
+    n, # of events, starting list (n ints), events (3 ints each)
+"""
+from __future__ import annotations
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from array import array
+
+PASS, SWAP, MOVE, LIFT, DROP = range(5)
+OP_NAMES = ('PASS', 'SWAP', 'MOVE', 'LIFT', 'DROP')
+HOLE = '_'
+DEFAULT_CHECKPOINT = 1 << 16 # events
+
+
+class SortTrace:
+    __slots__ = ('initial', 'events')
+
+    def __init__(self, lst: List[int], events: Optional[array]=None) -> None:
+        self.initial = array('q', lst)
+        self.events = array('q') if events is None else events
+
+    def __len__(self) -> int:
+        return len(self.events) // 3
+
+    def record(self, op: int, i: int, j: int=0) -> None:
+        """Log one event"""
+        self.events.extend((op, i, j))
+
+    def event(self, k: int) -> Tuple[int, int, int]:
+        """Get the k-th event as (op, i, j)"""
+        return tuple(self.events[3 * k:3 * k + 3])
+
+    def save(self, path: str) -> None:
+        """Write trace to a binary file"""
+        with open(path, 'wb') as f:
+            array('q', (len(self.initial), len(self))).tofile(f)
+            self.initial.tofile(f)
+            self.events.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> SortTrace:
+        """Read a trace written by save"""
+        with open(path, 'rb') as f:
+            header = array('q')
+            header.fromfile(f, 2)
+            trace = cls([])
+            trace.initial.fromfile(f, header[0])
+            trace.events.fromfile(f, 3 * header[1])
+
+        return trace
+
+
+class Frame(NamedTuple):
+    idx: int # events applied so far, including this one
+    op: int
+    i: int
+    j: int
+    state: List # the list after this event (HOLE where something was lifted)
+
+
+class Replay:
+    __slots__ = ('trace', 'checkpoint_every', '_checkpoints')
+
+    def __init__(self, trace: SortTrace,
+                 checkpoint_every: int=DEFAULT_CHECKPOINT) -> None:
+        self.trace = trace
+        self.checkpoint_every = checkpoint_every
+        self._checkpoints = {0: (trace.initial.tolist(), None, None)}
+
+    def seek(self, k: int) -> List:
+        """Get the state after the first k events (all of them if k is bigger)"""
+        k = min(k, len(self.trace))
+        for frame in self.frames(k - 1 if k else 0, k):
+            return frame.state
+        return self._checkpoints[0][0][:]
+
+    def frames(self, start: int=0, stop: Optional[int]=None,
+               step: int=1) -> Iterator[Frame]:
+        """Replay events [start, stop), yielding every step-th frame"""
+        events = self.trace.events
+        total = len(self.trace)
+        stop = total if stop is None else min(stop, total)
+        every = self.checkpoint_every
+
+        # start from the nearest checkpoint at or before start
+        base = max(k for k in self._checkpoints if k <= start)
+        state, hand, hole = self._checkpoints[base]
+        state = state[:]
+        for k in range(base, stop):
+            if k % every == 0 and k not in self._checkpoints:
+                self._checkpoints[k] = (state[:], hand, hole)
+
+            op, i, j = events[3 * k], events[3 * k + 1], events[3 * k + 2]
+            if op == SWAP:
+                state[i], state[j] = state[j], state[i]
+            elif op == MOVE:
+                state[i] = state[j]
+                if hole == i:
+                    hole = j
+                    state[j] = HOLE
+            elif op == LIFT:
+                hand = state[i]
+                hole = i
+                state[i] = HOLE
+            elif op == DROP:
+                state[i] = hand
+                hand = hole = None
+
+            if k >= start and (k - start) % step == 0:
+                yield Frame(k + 1, op, i, j, state[:])
+
+
+def pointer_line(state: List, idxs: Tuple[int, ...]) -> str:
+    """Get a line with a ^ under each of the given indices of str(state)"""
+    line = ''
+    col = 1 # skip the '['
+    for idx, item in enumerate(state):
+        if idx in idxs:
+            line += ' ' * (col - len(line)) + '^'
+        col += len(str(item)) + 2 # ', '
+
+    return line
+
+
+def render(trace: SortTrace, start: int=0, stop: Optional[int]=None,
+           step: int=1) -> Iterator[str]:
+    """Lazily format frames of a trace as printable lines"""
+    for frame in Replay(trace).frames(start, stop, step):
+        if frame.op == PASS:
+            yield f"\tIteration {frame.i}"
+            continue
+
+        state = '[' + ', '.join(str(x) for x in frame.state) + ']'
+        yield f"\t\t{OP_NAMES[frame.op]}: {state}"
+        if frame.op in (SWAP, MOVE):
+            yield f"\t\t      {pointer_line(frame.state, (frame.i, frame.j))}"
+
+
+# main
+if __name__ == "__main__":
+    from time import perf_counter
+    import corpus
+    from insertion_sort import insertion_sort_traced
+
+    # record a 10^5 element insertion sort (nearly sorted, so it's not O(n^2))
+    lst = corpus.load('nearly_sorted', 10**5, k=10).tolist()
+    start = perf_counter()
+    trace = insertion_sort_traced(lst)
+    print(f"recorded {len(trace)} events in {perf_counter() - start:.3f} s")
+
+    start = perf_counter()
+    replay = Replay(trace)
+    last = replay.seek(len(trace))
+    print(f"replayed to the end in {perf_counter() - start:.3f} s")
+    assert last == lst
+
+    # seeking past the end stops at the end, not back at the start
+    small = insertion_sort_traced([2, 1])
+    assert Replay(small).seek(len(small) + 100) == [1, 2]
+
+    # sample every 5% of the second half (seek reuses the checkpoints from above)
+    for frame in replay.frames(len(trace) // 2, step=len(trace) // 20):
+        print(frame.idx, OP_NAMES[frame.op], frame.i, frame.j)
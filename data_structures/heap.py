@@ -8,6 +8,8 @@ Abstract base class for heap implementations
 from abc import ABC, abstractmethod
 
 class Heap(ABC):
+    __slots__ = () # lets subclasses that define __slots__ skip the __dict__
+
     @abstractmethod
     def insert(self, item):
         pass
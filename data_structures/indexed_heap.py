@@ -0,0 +1,246 @@
+"""
+Written by Nat Getahun
+
+Indexed D-ary Heap
+------------------
+A min heap of (handle, priority) pairs where every node has d children instead
+of 2: the children of slot i live at di + 1 through di + d, and its parent lives
+at (i - 1) // d. Wider nodes make the tree shallower (log_d(n) levels), so sifting
+up is cheaper, while sifting down has to scan up to d siblings per level - but
+those siblings sit next to each other in memory. d = 4 is usually the sweet spot.
+
+Alongside the heap, a position map tracks which slot every handle currently
+sits in (kept up to date on every move). That lets us find any handle in O(1)
+and change its priority or remove it in place with a single sift, rather than
+pushing a duplicate and skipping stale entries later.
+
+Handles can be anything hashable and must be unique. Inserting a bare item
+(no priority) uses the item as its own priority, so it also works as a plain
+heap.
+
+Complexity:
+    Insert/Decrease key: O(log_d(n))
+    Pop/Increase key/Remove: O(dlog_d(n))
+    Peek/Contains/Size: O(1)
+    Space: O(n)
+"""
+from __future__ import annotations
+from typing import Any, Dict, Hashable, List, Tuple
+from heap import Heap
+
+
+class IndexedHeap(Heap):
+    __slots__ = ('_d', '_handles', '_prios', '_pos')
+
+    def __init__(self, d: int=4) -> None:
+        if d < 2:
+            raise ValueError("heap arity must be at least 2")
+
+        self._d = d
+        self._handles: List[Hashable] = []
+        self._prios: List[Any] = []
+        self._pos: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __contains__(self, handle: Hashable) -> bool:
+        return handle in self._pos
+
+    def __repr__(self) -> str:
+        pairs = list(zip(self._handles, self._prios))
+        return f"IndexedHeap({pairs}, d={self._d})"
+
+    def insert(self, handle: Hashable, priority: Any=None) -> None:
+        """Add handle with the given priority (or itself as the priority)"""
+        if handle in self._pos:
+            raise ValueError(f"{handle!r} is already in the heap")
+
+        self._pos[handle] = len(self._handles)
+        self._handles.append(handle)
+        self._prios.append(handle if priority is None else priority)
+        self._sift_up(len(self._handles) - 1)
+
+    def peek(self) -> Tuple[Hashable, Any]:
+        """Get (handle, priority) with the smallest priority without removing it"""
+        if not self._handles:
+            raise IndexError("peek at empty heap")
+        return self._handles[0], self._prios[0]
+
+    def pop(self) -> Tuple[Hashable, Any]:
+        """Remove and return (handle, priority) with the smallest priority"""
+        if not self._handles:
+            raise IndexError("pop from empty heap")
+
+        top = self._handles[0], self._prios[0]
+        self._remove_at(0)
+        return top
+
+    def priority(self, handle: Hashable) -> Any:
+        """Get the current priority of handle"""
+        return self._prios[self._pos[handle]]
+
+    def update(self, handle: Hashable, priority: Any) -> None:
+        """Set the priority of handle, moving it whichever way it needs to go"""
+        idx = self._pos[handle]
+        old = self._prios[idx]
+        self._prios[idx] = priority
+        if priority < old:
+            self._sift_up(idx)
+        else:
+            self._sift_down(idx)
+
+    def decrease_key(self, handle: Hashable, priority: Any) -> None:
+        """Lower the priority of handle"""
+        idx = self._pos[handle]
+        if self._prios[idx] < priority:
+            raise ValueError("new priority is larger than the current one")
+
+        self._prios[idx] = priority
+        self._sift_up(idx)
+
+    def increase_key(self, handle: Hashable, priority: Any) -> None:
+        """Raise the priority of handle"""
+        idx = self._pos[handle]
+        if priority < self._prios[idx]:
+            raise ValueError("new priority is smaller than the current one")
+
+        self._prios[idx] = priority
+        self._sift_down(idx)
+
+    def remove(self, handle: Hashable) -> Any:
+        """Remove handle from the heap and return its priority"""
+        idx = self._pos[handle]
+        priority = self._prios[idx]
+        self._remove_at(idx)
+        return priority
+
+    def height(self) -> int:
+        """Get # of levels in the tree"""
+        levels = 0
+        width = 1
+        remaining = len(self._handles)
+        while remaining > 0:
+            remaining -= width
+            width *= self._d
+            levels += 1
+
+        return levels
+
+    def size(self) -> int:
+        """Get # of items in the heap"""
+        return len(self._handles)
+
+    def is_empty(self) -> bool:
+        """Check whether heap has no items"""
+        return not self._handles
+
+    def _remove_at(self, idx: int) -> None:
+        """Drop the item at idx, filling the hole with the last item"""
+        handles = self._handles
+        prios = self._prios
+        del self._pos[handles[idx]]
+
+        last_handle = handles.pop()
+        last_prio = prios.pop()
+        if idx == len(handles): # removed the last slot, nothing to fill
+            return
+
+        old = prios[idx]
+        handles[idx] = last_handle
+        prios[idx] = last_prio
+        self._pos[last_handle] = idx
+        if last_prio < old:
+            self._sift_up(idx)
+        else:
+            self._sift_down(idx)
+
+    def _swap(self, idx1: int, idx2: int) -> None:
+        """Swap the items at idx1 and idx2, keeping the position map in sync"""
+        handles = self._handles
+        prios = self._prios
+        handles[idx1], handles[idx2] = handles[idx2], handles[idx1]
+        prios[idx1], prios[idx2] = prios[idx2], prios[idx1]
+        self._pos[handles[idx1]] = idx1
+        self._pos[handles[idx2]] = idx2
+
+    def _sift_up(self, idx: int) -> None:
+        """Move item at idx up until its parent's priority is <= its own"""
+        handles = self._handles
+        prios = self._prios
+        pos = self._pos
+        d = self._d
+        handle = handles[idx]
+        prio = prios[idx]
+        while idx > 0:
+            parent = (idx - 1) // d
+            if not prio < prios[parent]:
+                break
+            handles[idx] = handles[parent]
+            prios[idx] = prios[parent]
+            pos[handles[idx]] = idx
+            idx = parent
+
+        handles[idx] = handle
+        prios[idx] = prio
+        pos[handle] = idx
+
+    def _sift_down(self, idx: int) -> None:
+        """Move item at idx down until its priority is <= all of its children's"""
+        handles = self._handles
+        prios = self._prios
+        pos = self._pos
+        d = self._d
+        n = len(handles)
+        handle = handles[idx]
+        prio = prios[idx]
+        first = d * idx + 1
+        while first < n:
+            # find the smallest of the (up to d) children
+            child = first
+            for sibling in range(first + 1, min(first + d, n)):
+                if prios[sibling] < prios[child]:
+                    child = sibling
+
+            if not prios[child] < prio:
+                break
+            handles[idx] = handles[child]
+            prios[idx] = prios[child]
+            pos[handles[idx]] = idx
+            idx = child
+            first = d * idx + 1
+
+        handles[idx] = handle
+        prios[idx] = prio
+        pos[handle] = idx
+
+
+# main
+if __name__ == "__main__":
+    from random import random, randrange, seed
+    from time import perf_counter
+
+    # benchmark: mixed workload of 10^6 ops (40% insert, 30% pop, 10% each of
+    # decrease_key, increase_key, and update to a fresh priority either way)
+    for d in (2, 4, 8):
+        seed(0) # so every d runs the exact same workload
+        ops = [random() for _ in range(1_000_000)]
+        h = IndexedHeap(d)
+        start = perf_counter()
+        for handle, op in enumerate(ops):
+            if op < 0.4 or not h:
+                h.insert(handle, random())
+            elif op < 0.7:
+                h.pop()
+            else: # any live handle will do, so grab whichever is in a random slot
+                target = h._handles[randrange(len(h))]
+                if op < 0.8:
+                    h.decrease_key(target, h.priority(target) * random())
+                elif op < 0.9:
+                    h.increase_key(target, h.priority(target) + random())
+                else:
+                    h.update(target, random())
+        print(f"d = {d}: {perf_counter() - start:.3f} s")
+    # d = 2: 4.247 s
+    # d = 4: 3.027 s
+    # d = 8: 2.401 s
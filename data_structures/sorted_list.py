@@ -0,0 +1,359 @@
+"""
+Written by Nat Getahun
+
+Sorted List
+-----------
+A list that stays sorted under inserts and deletes. Keeping one big sorted list
+means every insert shifts O(n) items over (and rebuilding it, like insert_rcr
+did, allocates a whole new list per insert). Instead the items are split into
+chunks of roughly DEFAULT_LOAD sorted items each, where the last item of each
+chunk is also kept in _maxes:
+    - finding a value's chunk is a bisect over _maxes
+    - inserting into or deleting from a chunk only shifts within that chunk
+    - a chunk that grows past 2 * load gets split in half, and one that shrinks
+    below load / 2 gets merged into its neighbour, so chunks stay about the same
+    size
+
+Positions (for indexing, bisect, and index) come from a Fenwick tree over the
+chunk lengths: the # of items before chunk i is a prefix sum, and the chunk
+holding position p is found by walking down the tree. Splitting or merging
+chunks changes the tree's shape, so it just gets thrown away and rebuilt (O(# of
+chunks)) the next time a position is needed.
+
+update sorts the new values and, if there are enough of them, merges them in
+with everything already there in one go, then re-chunks. Otherwise they're
+just added one at a time.
+
+Complexity:
+    Add/Remove/Bisect/Index/Getitem: O(logn) amortized (plus an O(load) shift)
+    Update: O(n + klogk) for k new values
+    Irange: O(logn + # of items yielded)
+    Space: O(n)
+"""
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+
+DEFAULT_LOAD = 1000
+
+
+class SortedList:
+    __slots__ = ('_lists', '_maxes', '_index', '_load', '_len')
+
+    def __init__(self, items: Iterable[Any]=(), load: int=DEFAULT_LOAD) -> None:
+        self._lists: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._index: Optional[List[int]] = None # fenwick tree, None when stale
+        self._load = load
+        self._len = 0
+        self.update(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def __contains__(self, value: Any) -> bool:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+
+        chunk = self._lists[i]
+        return chunk[bisect_left(chunk, value)] == value
+
+    def __getitem__(self, idx: int) -> Any:
+        i, j = self._locate(idx)
+        return self._lists[i][j]
+
+    def __repr__(self) -> str:
+        return f"SortedList({list(self)})"
+
+    # updates
+    def add(self, value: Any) -> None:
+        """Insert value, after any items equal to it"""
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._index = None
+        else:
+            i = bisect_right(self._maxes, value)
+            if i == len(self._maxes): # new max, goes at the end of the last chunk
+                i -= 1
+                self._lists[i].append(value)
+                self._maxes[i] = value
+            else:
+                insort(self._lists[i], value)
+
+            self._grow(i, 1)
+            if len(self._lists[i]) > 2 * self._load:
+                self._split(i)
+
+        self._len += 1
+
+    def update(self, items: Iterable[Any]) -> None:
+        """Insert every item, merging them all in at once if there are many"""
+        values = sorted(items)
+        if not values:
+            return
+
+        if 4 * len(values) >= self._len: # cheaper to merge and re-chunk
+            if self._lists:
+                # two sorted runs, so this sort is just one linear merge
+                values = sorted(chain(self, values))
+            load = self._load
+            self._lists = [values[lo:lo + load]
+                           for lo in range(0, len(values), load)]
+            self._maxes = [chunk[-1] for chunk in self._lists]
+            self._index = None
+            self._len = len(values)
+        else:
+            for value in values:
+                self.add(value)
+
+    def remove(self, value: Any) -> None:
+        """Remove one occurrence of value (ValueError if there isn't one)"""
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in SortedList")
+
+    def discard(self, value: Any) -> bool:
+        """Remove one occurrence of value if there is one, returns if there was"""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+
+        chunk = self._lists[i]
+        j = bisect_left(chunk, value)
+        if chunk[j] != value:
+            return False
+
+        self._delete(i, j)
+        return True
+
+    def pop(self, idx: int=-1) -> Any:
+        """Remove and return the item at position idx"""
+        i, j = self._locate(idx)
+        value = self._lists[i][j]
+        self._delete(i, j)
+        return value
+
+    # positions
+    def bisect_left(self, value: Any) -> int:
+        """Get the position value would be inserted at, before equal items"""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+
+        return self._offset(i) + bisect_left(self._lists[i], value)
+
+    def bisect_right(self, value: Any) -> int:
+        """Get the position value would be inserted at, after equal items"""
+        i = bisect_right(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+
+        return self._offset(i) + bisect_right(self._lists[i], value)
+
+    bisect = bisect_right
+
+    def index(self, value: Any) -> int:
+        """Get the position of the first occurrence of value"""
+        i = bisect_left(self._maxes, value)
+        if i < len(self._maxes):
+            chunk = self._lists[i]
+            j = bisect_left(chunk, value)
+            if chunk[j] == value:
+                return self._offset(i) + j
+
+        raise ValueError(f"{value!r} not in SortedList")
+
+    def irange(self, minimum: Any=None, maximum: Any=None,
+               inclusive: Tuple[bool, bool]=(True, True),
+               reverse: bool=False) -> Iterator[Any]:
+        """Iterate over the items between minimum and maximum (None = no bound)"""
+        lo = 0
+        if minimum is not None:
+            lo = (self.bisect_left if inclusive[0] else self.bisect_right)(minimum)
+        hi = self._len
+        if maximum is not None:
+            hi = (self.bisect_right if inclusive[1] else self.bisect_left)(maximum)
+
+        if lo >= hi:
+            return iter(())
+        if reverse:
+            return self._islice_reversed(lo, hi)
+        return self._islice(lo, hi)
+
+    # helpers
+    def _islice(self, lo: int, hi: int) -> Iterator[Any]:
+        """Iterate over positions lo to hi without flattening everything"""
+        i, j = self._locate(lo)
+        first = islice(self._lists[i], j, None)
+        rest = chain.from_iterable(islice(self._lists, i + 1, None))
+        return islice(chain(first, rest), hi - lo)
+
+    def _islice_reversed(self, lo: int, hi: int) -> Iterator[Any]:
+        """Iterate backwards over positions hi - 1 down to lo"""
+        i, j = self._locate(hi - 1)
+        first = reversed(self._lists[i][:j + 1])
+        rest = chain.from_iterable(map(reversed, reversed(self._lists[:i])))
+        return islice(chain(first, rest), hi - lo)
+
+    def _delete(self, i: int, j: int) -> None:
+        """Delete chunk i's jth item, merging the chunk away if it gets small"""
+        chunk = self._lists[i]
+        del chunk[j]
+        self._len -= 1
+
+        if not chunk:
+            del self._lists[i]
+            del self._maxes[i]
+            self._index = None
+            return
+
+        self._maxes[i] = chunk[-1]
+        self._grow(i, -1)
+        if len(chunk) < self._load // 2 and len(self._lists) > 1:
+            self._merge(i)
+
+    def _split(self, i: int) -> None:
+        """Split chunk i in half"""
+        chunk = self._lists[i]
+        half = chunk[self._load:]
+        del chunk[self._load:]
+        self._lists.insert(i + 1, half)
+        self._maxes[i] = chunk[-1]
+        self._maxes.insert(i + 1, half[-1])
+        self._index = None
+
+    def _merge(self, i: int) -> None:
+        """Merge chunk i into a neighbour (then split it again if too big)"""
+        if i == len(self._lists) - 1:
+            i -= 1
+
+        self._lists[i].extend(self._lists.pop(i + 1))
+        self._maxes[i] = self._maxes.pop(i + 1)
+        self._index = None
+        if len(self._lists[i]) > 2 * self._load:
+            self._split(i)
+
+    def _build_index(self) -> List[int]:
+        """Build the fenwick tree of chunk lengths (1-indexed) in O(# chunks)"""
+        tree = [0]
+        tree.extend(map(len, self._lists))
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+        self._index = tree
+        return tree
+
+    def _grow(self, i: int, delta: int) -> None:
+        """Add delta to chunk i's length in the tree (if it's been built)"""
+        tree = self._index
+        if tree is not None:
+            i += 1
+            while i < len(tree):
+                tree[i] += delta
+                i += i & -i
+
+    def _offset(self, i: int) -> int:
+        """Get the # of items in the chunks before chunk i"""
+        tree = self._index if self._index is not None else self._build_index()
+        total = 0
+        while i:
+            total += tree[i]
+            i -= i & -i
+
+        return total
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        """Get (chunk, offset in chunk) for position idx (negatives allowed)"""
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("SortedList index out of range")
+
+        tree = self._index if self._index is not None else self._build_index()
+        # walk down the tree, skipping whole subtrees of chunks that come before
+        i = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = i + step
+            if nxt < len(tree) and tree[nxt] <= idx:
+                idx -= tree[nxt]
+                i = nxt
+            step >>= 1
+
+        return i, idx
+
+
+# main
+if __name__ == "__main__":
+    from bisect import insort as insort_list
+    from random import Random
+    from time import perf_counter
+
+    # benchmark: a stream of n updates (adds, with every 4th a remove)
+    def make_ops(n, rng):
+        ops = []
+        live = []
+        for t in range(n):
+            if t % 4 == 3:
+                ops.append((False, live.pop(rng.randrange(len(live)))))
+            else:
+                value = rng.random()
+                ops.append((True, value))
+                live.append(value)
+        return ops, sorted(live)
+
+    def resort(ops):
+        lst = []
+        for is_add, value in ops:
+            if is_add:
+                lst.append(value)
+            else:
+                lst.remove(value)
+            lst.sort()
+        return lst
+
+    def insort_plain(ops):
+        lst = []
+        for is_add, value in ops:
+            if is_add:
+                insort_list(lst, value)
+            else:
+                del lst[bisect_left(lst, value)]
+        return lst
+
+    def sorted_list(ops):
+        sl = SortedList()
+        for is_add, value in ops:
+            if is_add:
+                sl.add(value)
+            else:
+                sl.remove(value)
+        return list(sl)
+
+    rng = Random(0)
+    for n in (2 * 10**4, 10**6):
+        ops, expected = make_ops(n, rng)
+        print(f"{n} updates")
+        for f in (resort, insort_plain, sorted_list):
+            if f is resort and n > 10**5: # quadratic, would take hours
+                continue
+            start = perf_counter()
+            assert f(ops) == expected
+            print(f"\t{f.__name__}: {perf_counter() - start:.3f} s")
+    # 20000 updates
+    #     resort: 0.351 s
+    #     insort_plain: 0.013 s
+    #     sorted_list: 0.013 s
+    # 1000000 updates
+    #     insort_plain: 37.222 s (O(n) shift per update catches up with it)
+    #     sorted_list: 1.555 s
@@ -0,0 +1,132 @@
+"""
+Written by Nat Getahun
+
+Top K
+-----
+Getting the k smallest (or largest) items of a stream without sorting, or even
+holding onto, the whole thing. We keep the best k seen so far in a BinaryHeap
+that's ordered the opposite way - a max heap when we want the smallest - so the
+worst of the current top k is always at the top. Every new item is compared to
+that one; if it's better, it takes its place with a single replace (one sift).
+At the end, the heap is popped empty and reversed.
+
+With a key, each heap entry is (key, position, item): keys are computed once per
+item, ties on the key fall back to where the item showed up (so results are
+stable, matching sorted()[:k]), and items themselves never get compared.
+
+partial_sort does the same thing in place on a list: afterwards lst[:k] holds
+the k smallest in order, and everything else is somewhere in lst[k:].
+
+Complexity:
+    Time: O(nlogk)
+    Space: O(k)
+"""
+from __future__ import annotations
+from typing import Any, Callable, Iterable, List, Optional
+from itertools import islice
+from binary_heap import BinaryHeap
+
+
+def nsmallest(iterable: Iterable[Any], k: int,
+              key: Optional[Callable[[Any], Any]]=None) -> List[Any]:
+    """Get the k smallest items in one pass, smallest first"""
+    return _top_k(iterable, k, key, largest=False)
+
+
+def nlargest(iterable: Iterable[Any], k: int,
+             key: Optional[Callable[[Any], Any]]=None) -> List[Any]:
+    """Get the k largest items in one pass, largest first"""
+    return _top_k(iterable, k, key, largest=True)
+
+
+def _top_k(it: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]],
+           largest: bool) -> List[Any]:
+    """Keep the best k items of it in a heap with the worst of them on top"""
+    if k <= 0:
+        return []
+    if hasattr(it, '__len__') and k >= len(it): # keeping everything, just sort
+        return sorted(it, key=key, reverse=largest)
+
+    it = iter(it)
+    if key is None:
+        heap = BinaryHeap(islice(it, k), max_heap=not largest)
+        if largest:
+            for item in it:
+                if item > heap.peek():
+                    heap.replace(item)
+        else:
+            for item in it:
+                if item < heap.peek():
+                    heap.replace(item)
+
+        return heap.pop_many(k)[::-1]
+
+    # (key, position, item): position breaks ties, so items are never compared
+    # and later items lose ties (nlargest negates it to get the same effect)
+    sign = -1 if largest else 1
+    heap = BinaryHeap(((key(item), sign * pos, item)
+                       for pos, item in enumerate(islice(it, k))),
+                      max_heap=not largest)
+    pos = k
+    if largest:
+        for item in it:
+            k_item = key(item)
+            if k_item > heap.peek()[0]:
+                heap.replace((k_item, -pos, item))
+            pos += 1
+    else:
+        for item in it:
+            k_item = key(item)
+            if k_item < heap.peek()[0]:
+                heap.replace((k_item, pos, item))
+            pos += 1
+
+    return [entry[2] for entry in heap.pop_many(k)[::-1]]
+
+
+def partial_sort(lst: List[Any], k: int) -> None:
+    """Rearrange lst in place so lst[:k] is its k smallest items, in order"""
+    k = min(k, len(lst))
+    if k <= 0:
+        return
+
+    heap = BinaryHeap(lst[:k], max_heap=True)
+    for i in range(k, len(lst)):
+        if lst[i] < heap.peek():
+            lst[i] = heap.replace(lst[i]) # evicted item takes the new one's spot
+
+    lst[:k] = heap.pop_many(k)[::-1]
+
+
+# main
+if __name__ == "__main__":
+    import heapq
+    from random import random
+    from time import perf_counter
+
+    # benchmark: k smallest of 10^6 floats as k / n grows
+    n = 10**6
+    nums = [random() for _ in range(n)]
+    for ratio in (0.0001, 0.001, 0.01, 0.1, 0.5):
+        k = int(n * ratio)
+
+        start = perf_counter()
+        out = nsmallest(nums, k)
+        ours = perf_counter() - start
+
+        start = perf_counter()
+        assert out == sorted(nums)[:k]
+        full = perf_counter() - start
+
+        start = perf_counter()
+        heapq.nsmallest(k, nums)
+        theirs = perf_counter() - start
+
+        print(f"k/n = {ratio}: nsmallest {ours:.3f} s, full sort {full:.3f} s, "
+              f"heapq.nsmallest {theirs:.3f} s")
+    # k/n = 0.0001: nsmallest 0.073 s, full sort 0.313 s, heapq.nsmallest 0.019 s
+    # k/n = 0.001: nsmallest 0.086 s, full sort 0.307 s, heapq.nsmallest 0.029 s
+    # k/n = 0.01: nsmallest 0.230 s, full sort 0.254 s, heapq.nsmallest 0.079 s
+    # k/n = 0.1: nsmallest 1.349 s, full sort 0.254 s, heapq.nsmallest 0.688 s
+    # k/n = 0.5: nsmallest 3.296 s, full sort 0.209 s, heapq.nsmallest 1.428 s
+    # => worth it while k/n stays around 1% or less, a full sort wins after that